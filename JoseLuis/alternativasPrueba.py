@@ -1,19 +1,23 @@
 import pandas as pd
 import numpy as np
 
+from alternativas_lote import columnas_alternativas, top_k_alternativas
+from cargador_muestreo import leer_muestreo
+from distancias import distancia_pares_km
+from indice_espacial import IndiceRadiobases
+
 PREFIX = "prueba - "
+K_ALTERNATIVAS = 3
 
 # ────────────────────────────────────────────────────────────────────
-# 1. Cargar y depurar
-df = pd.read_csv("Muestreo - Hoja1.csv", encoding="latin1")
-df = df.dropna(subset=["LAT_DECIMAL", "LON_DECIMAL",
-                       "LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"])
+# 1. Cargar y depurar (por bloques, solo columnas necesarias y coordenadas válidas)
+df = leer_muestreo("Muestreo - Hoja1.csv")
 
 # ────────────────────────────────────────────────────────────────────
 # 2. Distancia comunidad-radiobase
 coord_com = df[["LAT_DECIMAL", "LON_DECIMAL"]].to_numpy()
 coord_rb  = df[["LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"]].to_numpy()
-df["distancia_km_calculada"] = np.linalg.norm(coord_com - coord_rb, axis=1) * 111.32
+df["distancia_km_calculada"] = distancia_pares_km(coord_com, coord_rb)
 
 # Clasificar por rango; sólo buscaremos alternativas si > 30 km
 df["grupo_distancia"] = pd.cut(df["distancia_km_calculada"],
@@ -22,64 +26,36 @@ df["grupo_distancia"] = pd.cut(df["distancia_km_calculada"],
 
 # ────────────────────────────────────────────────────────────────────
 # 3. Preparar DataFrame-resumen (solo > 30 km)
-registros = []
-coords_rbs = df[["ID_RADIOBASE_CERCANA",
-                 "LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"]].drop_duplicates().to_numpy()
-
-for _, row in df[df["grupo_distancia"] == ">30 km"].iterrows():
-    # Coordenadas comunidad y radiobase asignada
-    lat_c, lon_c = row["LAT_DECIMAL"], row["LON_DECIMAL"]
-    lat_rb, lon_rb = row["LATITUD_RADIOBASE"], row["LONGITUD_RADIOBASE"]
-    dist_actual = row["distancia_km_calculada"]
-    id_actual   = row["ID_RADIOBASE_CERCANA"]
-
-    # Buscar alternativas (+50 %)
-    limite = dist_actual * 1.5
-    dists = np.linalg.norm(coords_rbs[:, 1:3].astype(float) - np.array([lat_c, lon_c]), axis=1) * 111.32
-    candidatos = [
-        (id_rb, float(lat_rb2), float(lon_rb2), d)
-        for (id_rb, lat_rb2, lon_rb2), d in zip(coords_rbs, dists)
-        if id_rb != id_actual and dist_actual < d <= limite
-    ]
-    candidatos = sorted(candidatos, key=lambda x: x[3])[:3]
-
-    registro = {
-        "Comunidad":                 row["NOM_LOC"],
-        "Coordenadas Comunidad":     f"({lat_c:.5f}, {lon_c:.5f})",
-        "ID radio actual":           id_actual,
-        "Punto actual más cercano":  f"({lat_rb:.5f}, {lon_rb:.5f})",
-        "Distancia actual (km)":     f"{dist_actual:.2f} km",
-    }
-
-    # Añadir hasta tres alternativas
-    for i, (id_rb, lat_alt, lon_alt, d_alt) in enumerate(candidatos, start=1):
-        registro.update({
-            f"ID Alternativa {i}":             id_rb,
-            f"Coordenadas Alternativa {i}":    f"({lat_alt:.5f}, {lon_alt:.5f})",
-            f"Distancia Alternativa {i} (km)": f"{d_alt:.2f} km",
-            f"Ruta Alternativa {i} (Google Maps)":
-                f"https://www.google.com/maps/dir/{lat_c},{lon_c}/{lat_alt},{lon_alt}",
-        })
+rbs = df[["ID_RADIOBASE_CERCANA",
+          "LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"]].drop_duplicates()
+indice = IndiceRadiobases(rbs[["LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"]].to_numpy(),
+                          ids=rbs["ID_RADIOBASE_CERCANA"].to_numpy())
 
-    # Rellenar con em-dash si faltan alternativas
-    for j in range(len(candidatos) + 1, 4):
-        registro.update({
-            f"ID Alternativa {j}":             "—",
-            f"Coordenadas Alternativa {j}":    "—",
-            f"Distancia Alternativa {j} (km)": "—",
-            f"Ruta Alternativa {j} (Google Maps)": "—",
-        })
+lejanas = df[df["grupo_distancia"] == ">30 km"]
+lat_c, lon_c = lejanas["LAT_DECIMAL"].to_numpy(), lejanas["LON_DECIMAL"].to_numpy()
+dist_actual = lejanas["distancia_km_calculada"].to_numpy()
 
-    registros.append(registro)
+# Buscar las K alternativas más cercanas (+50 %) para todas las comunidades a la vez
+top = top_k_alternativas(indice, lejanas[["LAT_DECIMAL", "LON_DECIMAL"]].to_numpy(), dist_actual,
+                         k=K_ALTERNATIVAS, excluir_ids=lejanas["ID_RADIOBASE_CERCANA"].to_numpy())
 
-df_resumen = pd.DataFrame(registros)
+df_resumen = pd.DataFrame({
+    "Comunidad":                 lejanas["NOM_LOC"].to_numpy(),
+    "Coordenadas Comunidad":     [f"({lat:.5f}, {lon:.5f})" for lat, lon in zip(lat_c, lon_c)],
+    "ID radio actual":           lejanas["ID_RADIOBASE_CERCANA"].to_numpy(),
+    "Punto actual más cercano":  [f"({lat:.5f}, {lon:.5f})" for lat, lon in
+                                  zip(lejanas["LATITUD_RADIOBASE"], lejanas["LONGITUD_RADIOBASE"])],
+    "Distancia actual (km)":     [f"{d:.2f} km" for d in dist_actual],
+    # Hasta K alternativas, rellenando con em-dash si faltan
+    **columnas_alternativas(top, lat_c, lon_c),
+})
 
 # ────────────────────────────────────────────────────────────────────
 # 4. Orden de columnas exacto
 orden = ["Comunidad", "Coordenadas Comunidad",
          "ID radio actual", "Punto actual más cercano",
          "Distancia actual (km)"]
-for n in range(1, 4):
+for n in range(1, K_ALTERNATIVAS + 1):
     orden.extend([
         f"ID Alternativa {n}",
         f"Coordenadas Alternativa {n}",
@@ -91,6 +67,6 @@ df_resumen = df_resumen[orden]
 
 # ────────────────────────────────────────────────────────────────────
 # 5. Guardar
-salida = PREFIX + "comunidades_mayor_30km_con_3_alternativas.csv"
+salida = PREFIX + f"comunidades_mayor_30km_con_{K_ALTERNATIVAS}_alternativas.csv"
 df_resumen.to_csv(salida, index=False)
 print(f"✅ Archivo generado: {salida}")
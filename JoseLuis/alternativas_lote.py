@@ -0,0 +1,189 @@
+import os
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from distancias import HOLGURA_RELATIVA, bloques_distancias
+
+# Formato largo: una fila por comunidad-alternativa
+#   fila             posición de la comunidad en la consulta
+#   id_comunidad     identificador de la comunidad (LLAVE o la fila si no hay)
+#   lat_comunidad, lng_comunidad
+#   rango            1 = alternativa más cercana de esa comunidad
+#   id_radiobase, lat, lng, distancia_km
+COLUMNAS_LARGO = [
+    "fila", "id_comunidad", "lat_comunidad", "lng_comunidad",
+    "rango", "id_radiobase", "lat", "lng", "distancia_km",
+]
+
+
+# Alternativas de radiobase para todas las comunidades en una sola llamada.
+# Una radiobase es alternativa si su distancia d cumple: actual < d <= actual * factor.
+# excluir_ids descarta, por comunidad, la radiobase que ya tiene asignada; conviene
+# pasarlo siempre que distancia_actual no se haya calculado con las mismas coordenadas.
+def buscar_alternativas_lote(indice, coords, distancia_actual, factor=1.5, ids_comunidad=None, excluir_ids=None):
+    coords = np.asarray(coords, dtype=float)
+    distancia_actual = np.asarray(distancia_actual, dtype=float)
+    filas, idx, dist = indice.en_anillo(coords, distancia_actual, distancia_actual * factor)
+    if excluir_ids is not None:
+        conservar = indice.identificadores(idx) != np.asarray(excluir_ids)[filas]
+        filas, idx, dist = filas[conservar], idx[conservar], dist[conservar]
+
+    # Posición de cada alternativa dentro de su comunidad (ya vienen ordenadas por distancia)
+    inicios = np.flatnonzero(np.r_[True, filas[1:] != filas[:-1]]) if len(filas) else np.empty(0, dtype=np.intp)
+    tamanos = np.diff(np.r_[inicios, len(filas)])
+    rango = np.arange(len(filas)) - np.repeat(inicios, tamanos) + 1
+
+    ids_comunidad = np.arange(len(coords)) if ids_comunidad is None else np.asarray(ids_comunidad)
+
+    return pd.DataFrame({
+        "fila": filas,
+        "id_comunidad": ids_comunidad[filas],
+        "lat_comunidad": coords[filas, 0],
+        "lng_comunidad": coords[filas, 1],
+        "rango": rango,
+        "id_radiobase": indice.identificadores(idx),
+        "lat": indice.coords[idx, 0],
+        "lng": indice.coords[idx, 1],
+        "distancia_km": dist,
+    }, columns=COLUMNAS_LARGO)
+
+
+# Las k alternativas más cercanas de cada comunidad (actual < d <= actual * factor).
+# Recorre la matriz de distancias por bloques y usa selección parcial (argpartition),
+# así que nunca se ordenan todas las candidatas. El borde interior lleva la misma
+# holgura que IndiceRadiobases.en_anillo; excluir_ids descarta además, por comunidad,
+# la radiobase que ya tiene asignada.
+def top_k_alternativas(indice, coords, distancia_actual, k=3, factor=1.5, excluir_ids=None, memoria_mb=256):
+    coords = np.asarray(coords, dtype=float)
+    distancia_actual = np.asarray(distancia_actual, dtype=float)
+    if excluir_ids is not None:
+        excluir_ids = np.asarray(excluir_ids)
+        ids_indice = indice.identificadores(np.arange(len(indice)))
+
+    idx = np.full((len(coords), k), -1, dtype=np.intp)
+    dist = np.full((len(coords), k), np.nan)
+    kk = min(k, len(indice))
+
+    for inicio, d in bloques_distancias(coords, indice.coords, memoria_mb):
+        fin = inicio + len(d)
+        actual = distancia_actual[inicio:fin, None]
+        fuera = (d <= actual * (1 + HOLGURA_RELATIVA)) | (d > actual * factor)
+        if excluir_ids is not None:
+            fuera |= ids_indice[None, :] == excluir_ids[inicio:fin, None]
+        d[fuera] = np.inf
+
+        if kk < d.shape[1]:
+            candidatos = np.argpartition(d, kk - 1, axis=1)[:, :kk]
+        else:
+            candidatos = np.broadcast_to(np.arange(d.shape[1]), d.shape)
+        d_candidatos = np.take_along_axis(d, candidatos, axis=1)
+        orden = np.argsort(d_candidatos, axis=1, kind="stable")
+        d_candidatos = np.take_along_axis(d_candidatos, orden, axis=1)
+        validas = np.isfinite(d_candidatos)
+
+        idx[inicio:fin, :kk] = np.where(validas, np.take_along_axis(candidatos, orden, axis=1), -1)
+        dist[inicio:fin, :kk] = np.where(validas, d_candidatos, np.nan)
+
+    faltan = idx < 0
+    seguro = np.where(faltan, 0, idx)
+    return {
+        "id": np.where(faltan, None, indice.identificadores(seguro).astype(object)),
+        "lat": np.where(faltan, np.nan, indice.coords[seguro, 0]),
+        "lng": np.where(faltan, np.nan, indice.coords[seguro, 1]),
+        "distancia": dist,
+    }
+
+
+# Mismos arreglos de ancho fijo (n, k) a partir del formato largo ya calculado.
+# ids_comunidad define el orden de las filas de salida.
+def top_k_desde_largo(largo, ids_comunidad, k=3):
+    n = len(ids_comunidad)
+    top = {
+        "id": np.full((n, k), None, dtype=object),
+        "lat": np.full((n, k), np.nan),
+        "lng": np.full((n, k), np.nan),
+        "distancia": np.full((n, k), np.nan),
+    }
+
+    seleccion = largo[largo["rango"] <= k]
+    filas = pd.Index(ids_comunidad).get_indexer(seleccion["id_comunidad"])
+    encontradas = filas >= 0
+    filas = filas[encontradas]
+    columnas = seleccion["rango"].to_numpy()[encontradas] - 1
+
+    for clave, columna in [("id", "id_radiobase"), ("lat", "lat"), ("lng", "lng"), ("distancia", "distancia_km")]:
+        top[clave][filas, columnas] = seleccion[columna].to_numpy()[encontradas]
+    return top
+
+
+def _concatenar(*partes):
+    return reduce(np.char.add, [np.asarray(p, dtype=str) for p in partes])
+
+
+# Coordenada como texto corto para URLs (hasta 6 decimales, sin ceros sobrantes).
+# No depende de si el arreglo viene en float32 o float64.
+def _texto_coordenada(valores):
+    return np.char.rstrip(np.char.rstrip(np.char.mod("%.6f", np.asarray(valores, dtype=float)), "0"), ".")
+
+
+# Columnas del reporte (ID, coordenadas, distancia y ruta de Google Maps) para las
+# k alternativas, con "—" donde faltan; todo con operaciones sobre arreglos.
+def columnas_alternativas(top, lat_comunidad, lng_comunidad):
+    k = top["distancia"].shape[1]
+    faltan = np.isnan(top["distancia"])
+    lat_c = _texto_coordenada(lat_comunidad)[:, None]
+    lng_c = _texto_coordenada(lng_comunidad)[:, None]
+
+    ids = top["id"].astype(str)
+    coordenadas = _concatenar("(", np.char.mod("%.5f", top["lat"]), ", ", np.char.mod("%.5f", top["lng"]), ")")
+    distancias = _concatenar(np.char.mod("%.2f", top["distancia"]), " km")
+    rutas = _concatenar(
+        "https://www.google.com/maps/dir/", lat_c, ",", lng_c, "/",
+        _texto_coordenada(top["lat"]), ",", _texto_coordenada(top["lng"]),
+    )
+
+    columnas = {}
+    for i in range(k):
+        n = i + 1
+        columnas[f"ID Alternativa {n}"] = np.where(faltan[:, i], "—", ids[:, i])
+        columnas[f"Coordenadas Alternativa {n}"] = np.where(faltan[:, i], "—", coordenadas[:, i])
+        columnas[f"Distancia Alternativa {n} (km)"] = np.where(faltan[:, i], "—", distancias[:, i])
+        columnas[f"Ruta Alternativa {n} (Google Maps)"] = np.where(faltan[:, i], "—", rutas[:, i])
+    return columnas
+
+
+# Texto legible "ID (lat, lng) → d km; ..." por comunidad, "—" si no tiene alternativas
+def texto_alternativas(largo, num_comunidades, con_id=True):
+    if largo.empty:
+        return pd.Series(["—"] * num_comunidades, index=range(num_comunidades))
+
+    textos = (
+        "(" + largo["lat"].map("{:.5f}".format)
+        + ", " + largo["lng"].map("{:.5f}".format)
+        + ") → " + largo["distancia_km"].map("{:.2f}".format) + " km"
+    )
+    if con_id:
+        textos = largo["id_radiobase"].astype(str) + " " + textos
+    por_comunidad = textos.groupby(largo["fila"].to_numpy()).agg("; ".join)
+    return por_comunidad.reindex(range(num_comunidades), fill_value="—")
+
+
+# Guarda el formato largo como Parquet (columnar y tipado) junto a los CSV legibles.
+# Sin pyarrow se guarda como CSV con el mismo nombre para no detener el proceso.
+def guardar_alternativas_largo(largo, ruta="alternativas_largo.parquet"):
+    try:
+        largo.to_parquet(ruta, index=False)
+        return ruta
+    except ImportError:
+        ruta_csv = os.path.splitext(ruta)[0] + ".csv"
+        print(f"⚠️ No se pudo guardar como Parquet. Instala pyarrow con: pip install pyarrow (se usará {ruta_csv})")
+        largo.to_csv(ruta_csv, index=False)
+        return ruta_csv
+
+
+def leer_alternativas_largo(ruta="alternativas_largo.parquet"):
+    if os.path.exists(ruta):
+        return pd.read_parquet(ruta)
+    return pd.read_csv(os.path.splitext(ruta)[0] + ".csv")
@@ -0,0 +1,134 @@
+import os
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from indice_espacial import IndiceRadiobases
+
+# Asignación de la radiobase más cercana repartida en varios procesos.
+# Localidades, radiobases y los arreglos de resultado viven en memoria compartida:
+# los trabajadores solo reciben (inicio, fin) de su fragmento y escriben el resultado
+# directamente en su lugar, así que no se serializa ningún arreglo y el orden de
+# salida es el mismo que el de entrada.
+# AsignadorParalelo crea la memoria compartida y el pool una sola vez (cada trabajador
+# arma su índice al arrancar) y después atiende bloque tras bloque con asignar().
+TAM_MINIMO_FRAGMENTO = 1_000
+
+# Estado de cada proceso trabajador (vistas sobre la memoria compartida e índice)
+_estado = {}
+
+
+def _crear_compartido(forma, tipo):
+    tipo = np.dtype(tipo)
+    tamano = max(1, int(np.prod(forma)) * tipo.itemsize)
+    shm = shared_memory.SharedMemory(create=True, size=tamano)
+    return shm, np.ndarray(forma, dtype=tipo, buffer=shm.buf)
+
+
+def _inicializar_trabajador(descriptores):
+    for clave, (nombre, forma, tipo) in descriptores.items():
+        shm = shared_memory.SharedMemory(name=nombre)
+        _estado["shm_" + clave] = shm  # mantener viva la referencia
+        _estado[clave] = np.ndarray(forma, dtype=tipo, buffer=shm.buf)
+    # Cada trabajador arma su índice una sola vez a partir de la memoria compartida
+    _estado["indice"] = IndiceRadiobases(_estado["radiobases"])
+
+
+def _procesar_fragmento(limites):
+    inicio, fin = limites
+    distancias, indices = _estado["indice"].vecinos(_estado["localidades"][inicio:fin], k=1)
+    _estado["distancias"][inicio:fin] = distancias[:, 0]
+    _estado["indices"][inicio:fin] = indices[:, 0]
+    return fin - inicio
+
+
+class AsignadorParalelo:
+    # capacidad: filas máximas por llamada a asignar() que caben en la memoria compartida
+    # (los bloques más grandes se atienden en partes). Con trabajadores <= 1 no se crea
+    # pool: todo corre en serie sobre `indice` en el proceso principal.
+    def __init__(self, indice, trabajadores=None, capacidad=1_000_000, tam_fragmento=50_000):
+        self.indice = indice
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.capacidad = max(1, capacidad)
+        self.tam_fragmento = tam_fragmento
+        self.compartidos = {}
+        self.pool = None
+
+    @property
+    def en_serie(self):
+        return self.trabajadores <= 1
+
+    def __enter__(self):
+        if self.en_serie:
+            return self
+        try:
+            radiobases = self.indice.coords
+            for clave, forma, tipo in [
+                ("localidades", (self.capacidad, 2), np.float64),
+                ("radiobases", radiobases.shape, radiobases.dtype),
+                ("distancias", (self.capacidad,), np.float64),
+                ("indices", (self.capacidad,), np.intp),
+            ]:
+                self.compartidos[clave] = _crear_compartido(forma, tipo)
+            self.compartidos["radiobases"][1][...] = radiobases
+
+            descriptores = {
+                clave: (shm.name, vista.shape, vista.dtype.str)
+                for clave, (shm, vista) in self.compartidos.items()
+            }
+            self.pool = get_context().Pool(
+                self.trabajadores, initializer=_inicializar_trabajador, initargs=(descriptores,)
+            )
+        except BaseException:
+            self.cerrar(terminar=True)
+            raise
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar(terminar=tipo is not None)
+
+    def cerrar(self, terminar=False):
+        if self.pool is not None:
+            if terminar:
+                self.pool.terminate()
+            else:
+                self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for shm, _ in self.compartidos.values():
+            shm.close()
+            shm.unlink()
+        self.compartidos = {}
+
+    # Distancia (km) e índice de la radiobase más cercana para cada localidad
+    def asignar(self, localidades):
+        localidades = np.ascontiguousarray(localidades, dtype=float)
+        if self.pool is None:
+            distancias, indices = self.indice.vecinos(localidades, k=1)
+            return distancias[:, 0], indices[:, 0]
+
+        distancias = np.empty(len(localidades))
+        indices = np.empty(len(localidades), dtype=np.intp)
+        for inicio in range(0, len(localidades), self.capacidad):
+            fin = min(inicio + self.capacidad, len(localidades))
+            distancias[inicio:fin], indices[inicio:fin] = self._asignar_parte(localidades[inicio:fin])
+        return distancias, indices
+
+    def _asignar_parte(self, localidades):
+        n = len(localidades)
+        self.compartidos["localidades"][1][:n] = localidades
+
+        # Al menos un fragmento por trabajador aunque el bloque sea chico
+        tam = min(self.tam_fragmento, max(TAM_MINIMO_FRAGMENTO, -(-n // self.trabajadores)))
+        fragmentos = [(inicio, min(inicio + tam, n)) for inicio in range(0, n, tam)]
+        procesadas = sum(self.pool.imap_unordered(_procesar_fragmento, fragmentos))
+        if procesadas != n:
+            raise RuntimeError(f"Se procesaron {procesadas} de {n} localidades.")
+        return self.compartidos["distancias"][1][:n].copy(), self.compartidos["indices"][1][:n].copy()
+
+
+# Asignación de una sola vez (crea y cierra el pool en la misma llamada)
+def asignar_paralelo(localidades, radiobases, trabajadores=None, tam_fragmento=50_000, indice=None):
+    indice = indice if indice is not None else IndiceRadiobases(radiobases)
+    with AsignadorParalelo(indice, trabajadores, capacidad=len(localidades), tam_fragmento=tam_fragmento) as asignador:
+        return asignador.asignar(localidades)
@@ -0,0 +1,60 @@
+import time
+import numpy as np
+
+from distancias import haversine_km
+from indice_espacial import IndiceRadiobases
+
+# Compara el ciclo original de coordenadas.py (fuerza bruta, una localidad a la vez)
+# contra el índice espacial, con puntos aleatorios dentro de México.
+LAT_MIN, LAT_MAX = 14.5, 32.7
+LNG_MIN, LNG_MAX = -117.1, -86.7
+
+TAMANOS_LOCALIDADES = [1_000, 10_000, 100_000, 300_000]
+NUM_RADIOBASES = 30_000
+MAX_FUERZA_BRUTA = 2_000  # arriba de esto se extrapola el tiempo de fuerza bruta
+
+rng = np.random.default_rng(0)
+
+
+def puntos_aleatorios(n):
+    return np.column_stack([
+        rng.uniform(LAT_MIN, LAT_MAX, n),
+        rng.uniform(LNG_MIN, LNG_MAX, n),
+    ])
+
+
+def fuerza_bruta(localidades, radiobases):
+    idx = np.empty(len(localidades), dtype=np.intp)
+    for i, coord1 in enumerate(localidades):
+        distancias = haversine_km(coord1[0], coord1[1], radiobases[:, 0], radiobases[:, 1])
+        idx[i] = np.argmin(distancias)
+    return idx
+
+
+radiobases = puntos_aleatorios(NUM_RADIOBASES)
+
+inicio = time.perf_counter()
+indice = IndiceRadiobases(radiobases)
+t_construccion = time.perf_counter() - inicio
+print(f"🌲 Índice sobre {NUM_RADIOBASES:,} radiobases construido en {t_construccion:.3f} s")
+print(f"{'localidades':>12} | {'fuerza bruta (s)':>18} | {'índice (s)':>10} | {'aceleración':>11}")
+
+for n in TAMANOS_LOCALIDADES:
+    localidades = puntos_aleatorios(n)
+
+    muestra = localidades[:MAX_FUERZA_BRUTA]
+    inicio = time.perf_counter()
+    idx_bruto = fuerza_bruta(muestra, radiobases)
+    t_bruto = (time.perf_counter() - inicio) * n / len(muestra)
+
+    inicio = time.perf_counter()
+    _, idx_indice = indice.vecinos(localidades, k=1)
+    t_indice = time.perf_counter() - inicio
+
+    # Los dos caminos deben elegir la misma radiobase
+    assert np.array_equal(idx_bruto, idx_indice[:len(muestra), 0])
+
+    marca = "*" if n > MAX_FUERZA_BRUTA else " "
+    print(f"{n:>12,} | {t_bruto:>17.2f}{marca} | {t_indice:>10.3f} | {t_bruto / t_indice:>10.0f}x")
+
+print(f"\n* tiempo extrapolado a partir de {MAX_FUERZA_BRUTA:,} localidades")
@@ -0,0 +1,45 @@
+import os
+import time
+import numpy as np
+
+from asignacion_paralela import asignar_paralelo
+
+# Aceleración de la asignación en paralelo según el número de procesos.
+# Uso: python benchmark_paralelo.py (idealmente en la máquina de 16 núcleos)
+LAT_MIN, LAT_MAX = 14.5, 32.7
+LNG_MIN, LNG_MAX = -117.1, -86.7
+
+NUM_LOCALIDADES = 4_000_000
+NUM_RADIOBASES = 50_000
+TRABAJADORES = [w for w in [1, 2, 4, 8, 16] if w <= (os.cpu_count() or 1)]
+
+
+def puntos_aleatorios(rng, n):
+    return np.column_stack([
+        rng.uniform(LAT_MIN, LAT_MAX, n),
+        rng.uniform(LNG_MIN, LNG_MAX, n),
+    ])
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    localidades = puntos_aleatorios(rng, NUM_LOCALIDADES)
+    radiobases = puntos_aleatorios(rng, NUM_RADIOBASES)
+
+    print(f"🧪 {NUM_LOCALIDADES:,} localidades × {NUM_RADIOBASES:,} radiobases, {os.cpu_count()} núcleos")
+    print(f"{'procesos':>8} | {'tiempo (s)':>10} | {'aceleración':>11} | {'eficiencia':>10}")
+
+    referencia = None
+    t_base = None
+    for trabajadores in TRABAJADORES:
+        inicio = time.perf_counter()
+        _, indices = asignar_paralelo(localidades, radiobases, trabajadores=trabajadores)
+        t = time.perf_counter() - inicio
+
+        if referencia is None:
+            referencia, t_base = indices, t
+        # Todas las corridas deben dar la misma asignación y en el mismo orden
+        assert np.array_equal(indices, referencia)
+
+        aceleracion = t_base / t
+        print(f"{trabajadores:>8} | {t:>10.2f} | {aceleracion:>10.1f}x | {aceleracion / trabajadores:>9.0%}")
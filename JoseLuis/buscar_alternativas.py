@@ -1,47 +1,34 @@
 import pandas as pd
-import numpy as np
+
+from alternativas_lote import buscar_alternativas_lote, guardar_alternativas_largo, texto_alternativas
+from indice_espacial import IndiceRadiobases
 
 # Cargar archivos originales y de distancias lejanas
 df_localidades = pd.read_csv('muestreo_localidades.csv', header=None, names=['lat', 'lng'], dtype=float)
 df_radiobases = pd.read_csv('muestreo_radiobases.csv', header=None, names=['lat', 'lng'], dtype=float)
 df_lejanas = pd.read_csv('distancias_lejanas.csv')
 
-coords_radiobases = df_radiobases[['lat', 'lng']].to_numpy()
-
-# Lista para los resultados
-resumen = []
-
-for _, fila in df_lejanas.iterrows():
-    lat1, lng1 = fila['lat1'], fila['lng1']
-    lat2, lng2 = fila['lat2'], fila['lng2']
-    distancia_actual = fila['distancia_km']
-    limite_superior = distancia_actual * 1.5
-
-    comunidad = f"({lat1:.5f}, {lng1:.5f})"
-    punto_actual = f"({lat2:.5f}, {lng2:.5f})"
-    distancia_txt = f"{distancia_actual:.2f} km"
+indice = IndiceRadiobases(df_radiobases[['lat', 'lng']].to_numpy())
 
-    # Revisar todas las radiobases como alternativas
-    coord1 = np.array([lat1, lng1])
-    distancias = np.linalg.norm(coords_radiobases - coord1, axis=1) * 111.32
+# Índice de la radiobase asignada: distancias_lejanas.csv solo trae sus coordenadas (lat2, lng2)
+_, asignada = indice.vecinos(df_lejanas[['lat2', 'lng2']].to_numpy(), k=1)
 
-    alternativas = []
-    for i, d in enumerate(distancias):
-        alt_lat, alt_lng = coords_radiobases[i]
-        if distancia_actual < d <= limite_superior:
-            alt_txt = f"({alt_lat:.5f}, {alt_lng:.5f}) → {d:.2f} km"
-            alternativas.append(alt_txt)
+# Revisar todas las radiobases como alternativas (actual < d <= actual * 1.5) en una sola consulta,
+# sin contar la radiobase asignada
+distancia_actual = df_lejanas['distancia_km'].to_numpy()
+alternativas = buscar_alternativas_lote(indice, df_lejanas[['lat1', 'lng1']].to_numpy(), distancia_actual,
+                                        excluir_ids=asignada[:, 0])
 
-    resumen.append({
-        "Comunidad": comunidad,
-        "Punto actual más cercano": punto_actual,
-        "Distancia actual (km)": distancia_txt,
-        "Alternativas (dentro de +50%)": "; ".join(alternativas) if alternativas else "—"
-    })
+df_resumen = pd.DataFrame({
+    "Comunidad": [f"({lat:.5f}, {lng:.5f})" for lat, lng in zip(df_lejanas['lat1'], df_lejanas['lng1'])],
+    "Punto actual más cercano": [f"({lat:.5f}, {lng:.5f})" for lat, lng in zip(df_lejanas['lat2'], df_lejanas['lng2'])],
+    "Distancia actual (km)": [f"{d:.2f} km" for d in distancia_actual],
+    "Alternativas (dentro de +50%)": texto_alternativas(alternativas, len(df_lejanas), con_id=False).to_numpy(),
+})
 
 # Guardar el resumen
-df_resumen = pd.DataFrame(resumen)
 df_resumen.to_csv('resumen_alternativas_legibles.csv', index=False)
+ruta_largo = guardar_alternativas_largo(alternativas, 'alternativas_lejanas_largo.parquet')
 
 try:
     df_resumen.to_excel('resumen_alternativas_legibles.xlsx', index=False)
@@ -49,3 +36,4 @@ except:
     print("⚠️ No se pudo guardar como Excel. Instala openpyxl con: pip install openpyxl")
 
 print("✅ Archivo generado: resumen_alternativas_legibles.csv")
+print(f"✅ Archivo generado: {ruta_largo}")
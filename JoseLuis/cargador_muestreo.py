@@ -0,0 +1,77 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Lectura por bloques de "Muestreo - Hoja1.csv".
+# Por defecto solo se leen las columnas que usan las etapas de distancia y clasificación, con
+# tipos explícitos (category para textos repetidos; las coordenadas se quedan en
+# float64 para que las distancias que se escriben coincidan con las coordenadas
+# escritas y no se pierdan decimales del original), y
+# cada bloque se filtra antes de pasar al siguiente paso; así la memoria no depende
+# del tamaño del archivo sino de tam_bloque.
+COLUMNAS_COORDENADAS = ["LAT_DECIMAL", "LON_DECIMAL", "LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"]
+
+TIPOS_MUESTREO = {
+    "NOM_LOC": "category",
+    "ID_RADIOBASE_CERCANA": "category",
+    "LAT_DECIMAL": "float64",
+    "LON_DECIMAL": "float64",
+    "LATITUD_RADIOBASE": "float64",
+    "LONGITUD_RADIOBASE": "float64",
+}
+
+# LLAVE se deja con el tipo que infiera pandas para que coincida al volver a leer los CSV
+COLUMNAS_MUESTREO = ["LLAVE"] + list(TIPOS_MUESTREO)
+
+
+# True para las filas con las cuatro coordenadas presentes y dentro de rango
+def coordenadas_validas(bloque):
+    latitudes = bloque[["LAT_DECIMAL", "LATITUD_RADIOBASE"]]
+    longitudes = bloque[["LON_DECIMAL", "LONGITUD_RADIOBASE"]]
+    return (latitudes.abs() <= 90).all(axis=1) & (longitudes.abs() <= 180).all(axis=1)
+
+
+# Columnas extra como {columna: tipo}; con tipo None se usa el que infiera pandas.
+# Una lista de nombres equivale a {columna: None}.
+def _tipos_extra(otras_columnas):
+    if isinstance(otras_columnas, dict):
+        return dict(otras_columnas)
+    return dict.fromkeys(otras_columnas)
+
+
+# Genera DataFrames de hasta tam_bloque filas. otras_columnas: columnas extra y su tipo
+# (ver _tipos_extra). Con todas=True se conservan todas las columnas de la hoja; las que
+# no tienen tipo aquí ni en otras_columnas se infieren bloque por bloque.
+def leer_muestreo_por_bloques(ruta, tam_bloque=200_000, otras_columnas=(), filtrar=True, encoding="latin1",
+                              todas=False):
+    extra = _tipos_extra(otras_columnas)
+    tipos = dict(TIPOS_MUESTREO)
+    tipos.update({columna: tipo for columna, tipo in extra.items() if tipo is not None})
+
+    lector = pd.read_csv(
+        ruta,
+        encoding=encoding,
+        usecols=None if todas else COLUMNAS_MUESTREO + list(extra),
+        dtype=tipos,
+        chunksize=tam_bloque,
+    )
+    for bloque in lector:
+        if filtrar:
+            bloque = bloque[coordenadas_validas(bloque)]
+        yield bloque.reset_index(drop=True)
+
+
+# Todo el archivo en un DataFrame, uniendo las categorías de cada bloque
+def leer_muestreo(ruta, tam_bloque=200_000, otras_columnas=(), filtrar=True, encoding="latin1", todas=False):
+    partes = list(leer_muestreo_por_bloques(ruta, tam_bloque, otras_columnas, filtrar, encoding, todas))
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_MUESTREO + list(otras_columnas))
+    if len(partes) == 1:
+        return partes[0]
+
+    columnas = {}
+    for columna in partes[0].columns:
+        if isinstance(partes[0][columna].dtype, pd.CategoricalDtype):
+            columnas[columna] = union_categoricals([p[columna] for p in partes], ignore_order=True)
+        else:
+            columnas[columna] = pd.concat([p[columna] for p in partes], ignore_index=True)
+    return pd.DataFrame(columnas)
@@ -0,0 +1,171 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+# Sketch de cuantiles tipo KLL: resume un flujo de valores en memoria acotada
+# (del orden de k · log(n)) y responde cualquier percentil con error de rango ~1/k.
+# Es combinable (combinar) para sumar sketches de varios procesos o archivos.
+# También lleva conteo, suma, suma de cuadrados, mínimo y máximo exactos.
+class SketchCuantiles:
+    def __init__(self, k=400, semilla=0):
+        self.k = k
+        self.compactores = [np.empty(0)]
+        self.rng = np.random.default_rng(semilla)
+        self.n = 0
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def actualizar(self, valores):
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return
+
+        self.n += len(valores)
+        self.suma += float(valores.sum())
+        self.suma_cuadrados += float((valores ** 2).sum())
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+
+        self.compactores[0] = np.concatenate([self.compactores[0], valores])
+        self._compactar()
+
+    def combinar(self, otro):
+        if otro.k != self.k:
+            raise ValueError("Solo se pueden combinar sketches con el mismo k.")
+        while len(self.compactores) < len(otro.compactores):
+            self.compactores.append(np.empty(0))
+        for nivel, compactor in enumerate(otro.compactores):
+            self.compactores[nivel] = np.concatenate([self.compactores[nivel], compactor])
+
+        self.n += otro.n
+        self.suma += otro.suma
+        self.suma_cuadrados += otro.suma_cuadrados
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        self._compactar()
+
+    # Cuantiles para q en [0, 1] (escalar o arreglo)
+    def cuantiles(self, q):
+        if self.n == 0:
+            raise ValueError("El sketch está vacío.")
+        q = np.asarray(q, dtype=float)
+
+        valores = np.concatenate(self.compactores)
+        pesos = np.concatenate([np.full(len(c), 2.0 ** nivel) for nivel, c in enumerate(self.compactores)])
+        orden = np.argsort(valores, kind="stable")
+        valores = valores[orden]
+        acumulado = np.cumsum(pesos[orden])
+
+        posiciones = np.searchsorted(acumulado, q * acumulado[-1], side="left")
+        resultado = valores[np.minimum(posiciones, len(valores) - 1)]
+        # Los extremos se conocen exactos
+        resultado = np.where(q <= 0, self.minimo, np.where(q >= 1, self.maximo, resultado))
+        return resultado if resultado.ndim else float(resultado)
+
+    # Equivalente a Series.describe() pero sin tener los datos en memoria
+    def describir(self):
+        media = self.suma / self.n
+        varianza = (self.suma_cuadrados - self.n * media ** 2) / max(1, self.n - 1)
+        p25, p50, p75 = self.cuantiles([0.25, 0.5, 0.75])
+        return pd.Series({
+            "count": float(self.n),
+            "mean": media,
+            "std": float(np.sqrt(max(varianza, 0.0))),
+            "min": self.minimo,
+            "25%": p25,
+            "50%": p50,
+            "75%": p75,
+            "max": self.maximo,
+        })
+
+    def _capacidad(self, nivel):
+        profundidad = len(self.compactores) - nivel - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** profundidad)))
+
+    def _compactar(self):
+        while True:
+            for nivel, compactor in enumerate(self.compactores):
+                if len(compactor) >= self._capacidad(nivel):
+                    self._compactar_nivel(nivel)
+                    break
+            else:
+                return
+
+    # Ordena el nivel y sube la mitad de los elementos (pares o impares, al azar)
+    # al nivel siguiente, donde pesan el doble; el peso total no cambia.
+    def _compactar_nivel(self, nivel):
+        if nivel + 1 == len(self.compactores):
+            self.compactores.append(np.empty(0))
+        compactor = np.sort(self.compactores[nivel])
+        sobrante = len(compactor) % 2
+        elegidos = compactor[sobrante:][self.rng.integers(2)::2]
+        self.compactores[nivel + 1] = np.concatenate([self.compactores[nivel + 1], elegidos])
+        self.compactores[nivel] = compactor[:sobrante]
+
+
+# Reparte filas en cubetas por distancia (archivos temporales) mientras llegan,
+# para poder separar cercanas/lejanas con un umbral que solo se conoce al final
+# sin volver a leer ni a calcular los datos: las cubetas enteras se copian tal cual
+# y solo la cubeta que contiene el umbral se filtra.
+class ParticionPorDistancia:
+    def __init__(self, columnas, columna_distancia="distancia_km", bordes=None, carpeta=None):
+        self.columnas = list(columnas)
+        self.columna_distancia = columna_distancia
+        # Cubeta i: bordes[i-1] < d <= bordes[i] (bordes geométricos de 10 m a 5000 km)
+        self.bordes = np.asarray(bordes if bordes is not None else np.geomspace(0.01, 5000, 96))
+        self.temporal = tempfile.TemporaryDirectory(dir=carpeta, prefix="particion_")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.temporal.cleanup()
+
+    def _ruta(self, cubeta):
+        return os.path.join(self.temporal.name, f"cubeta_{cubeta:03d}.csv")
+
+    def agregar(self, df):
+        cubetas = np.searchsorted(self.bordes, df[self.columna_distancia].to_numpy(), side="left")
+        for cubeta in np.unique(cubetas):
+            df[cubetas == cubeta].to_csv(self._ruta(cubeta), mode="a", header=False, index=False,
+                                         columns=self.columnas)
+
+    # Escribe los dos archivos finales; regresa cuántas filas quedaron en cada uno
+    def dividir(self, umbral, ruta_cercanas, ruta_lejanas):
+        conteos = {"cercanas": 0, "lejanas": 0}
+        with open(ruta_cercanas, "w", newline="", encoding="utf-8") as cercanas, \
+                open(ruta_lejanas, "w", newline="", encoding="utf-8") as lejanas:
+            encabezado = ",".join(self.columnas) + "\n"
+            cercanas.write(encabezado)
+            lejanas.write(encabezado)
+
+            for cubeta in range(len(self.bordes) + 1):
+                ruta = self._ruta(cubeta)
+                if not os.path.exists(ruta):
+                    continue
+                inferior = self.bordes[cubeta - 1] if cubeta > 0 else -np.inf
+                superior = self.bordes[cubeta] if cubeta < len(self.bordes) else np.inf
+
+                if superior <= umbral or inferior >= umbral:
+                    destino, clave = (cercanas, "cercanas") if superior <= umbral else (lejanas, "lejanas")
+                    with open(ruta, encoding="utf-8") as f:
+                        shutil.copyfileobj(f, destino)
+                    with open(ruta, "rb") as f:
+                        conteos[clave] += sum(1 for _ in f)
+                    continue
+
+                # La cubeta que contiene el umbral se separa fila por fila
+                for bloque in pd.read_csv(ruta, header=None, names=self.columnas, chunksize=200_000):
+                    cerca = bloque[self.columna_distancia] <= umbral
+                    bloque[cerca].to_csv(cercanas, header=False, index=False)
+                    bloque[~cerca].to_csv(lejanas, header=False, index=False)
+                    conteos["cercanas"] += int(cerca.sum())
+                    conteos["lejanas"] += int((~cerca).sum())
+        return conteos
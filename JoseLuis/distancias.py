@@ -0,0 +1,77 @@
+import numpy as np
+
+# Radio medio de la Tierra (IUGG)
+RADIO_TIERRA_KM = 6371.0088
+
+# Holgura relativa en los cortes de anillo: dos cálculos de la misma distancia pueden
+# diferir en el último bit, así que "d > actual" no basta para descartar la radiobase actual
+HOLGURA_RELATIVA = 1e-9
+
+# Bytes aproximados por celda de la matriz N×M (la matriz final más sus temporales)
+BYTES_POR_CELDA = 8 * 6
+
+
+# Distancia de gran círculo (haversine) en km.
+# Acepta escalares o arreglos compatibles por broadcasting.
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(x, dtype=float)) for x in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# Aproximación equirectangular en km: más rápida y muy precisa para distancias cortas
+def equirectangular_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(x, dtype=float)) for x in (lat1, lng1, lat2, lng2))
+    x = (lng2 - lng1) * np.cos((lat1 + lat2) / 2)
+    y = lat2 - lat1
+    return RADIO_TIERRA_KM * np.sqrt(x ** 2 + y ** 2)
+
+
+METODOS = {
+    "haversine": haversine_km,
+    "equirectangular": equirectangular_km,
+}
+
+
+# Distancia fila a fila entre dos arreglos (n, 2) de lat, lng
+def distancia_pares_km(coords1, coords2, metodo="haversine"):
+    coords1 = np.asarray(coords1, dtype=float)
+    coords2 = np.asarray(coords2, dtype=float)
+    return METODOS[metodo](coords1[:, 0], coords1[:, 1], coords2[:, 0], coords2[:, 1])
+
+
+# Cuántas filas caben en un bloque de la matriz N×M sin rebasar memoria_mb
+def filas_por_bloque(num_columnas, memoria_mb=256):
+    return max(1, int(memoria_mb * 2**20 // (max(1, num_columnas) * BYTES_POR_CELDA)))
+
+
+# Recorre la matriz de distancias origenes × destinos por bloques de filas.
+# Genera (inicio, bloque) donde bloque[i, j] es la distancia en km entre
+# origenes[inicio + i] y destinos[j]; nunca se construye la matriz completa.
+def bloques_distancias(origenes, destinos, memoria_mb=256, metodo="haversine"):
+    origenes = np.asarray(origenes, dtype=float)
+    destinos = np.asarray(destinos, dtype=float)
+    funcion = METODOS[metodo]
+    filas = filas_por_bloque(len(destinos), memoria_mb)
+
+    for inicio in range(0, len(origenes), filas):
+        bloque = origenes[inicio:inicio + filas]
+        yield inicio, funcion(bloque[:, 0:1], bloque[:, 1:2], destinos[None, :, 0], destinos[None, :, 1])
+
+
+# Coordenadas (lat, lng) en grados a vectores unitarios (x, y, z).
+# En la esfera unitaria la distancia euclidiana (cuerda) crece igual que la
+# de gran círculo, así que un KD-tree sobre (x, y, z) da vecinos exactos.
+def a_cartesianas(coords):
+    coords = np.radians(np.asarray(coords, dtype=float))
+    lat, lng = coords[:, 0], coords[:, 1]
+    return np.column_stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)])
+
+
+# Conversión entre cuerda en la esfera unitaria y km de gran círculo
+def cuerda_a_km(cuerda):
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.clip(np.asarray(cuerda, dtype=float) / 2, 0.0, 1.0))
+
+
+def km_a_cuerda(km):
+    return 2 * np.sin(np.clip(np.asarray(km, dtype=float) / (2 * RADIO_TIERRA_KM), 0.0, np.pi / 2))
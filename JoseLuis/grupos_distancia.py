@@ -0,0 +1,49 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Clasificación de comunidades por distancia a su radiobase y escritura, por bloques,
+# de muestreo_con_distancias.csv y de un archivo por grupo.
+ARCHIVO_DISTANCIAS = "muestreo_con_distancias.csv"
+GRUPOS = {
+    '<=3 km': "comunidades_menor_3km.csv",
+    '3-30 km': "comunidades_entre_3_30km.csv",
+    '>30 km': "comunidades_mayor_30km.csv",
+}
+GRUPO_LEJANO = '>30 km'
+
+
+def clasificar(distancias_km):
+    return pd.cut(distancias_km, bins=[-np.inf, 3, 30, np.inf], labels=list(GRUPOS))
+
+
+# Enlace de Google Maps de la comunidad a su radiobase asignada
+def rutas_google_maps(df):
+    return (
+        "https://www.google.com/maps/dir/"
+        + df['LAT_DECIMAL'].astype(str) + "," + df['LON_DECIMAL'].astype(str) + "/"
+        + df['LATITUD_RADIOBASE'].astype(str) + "," + df['LONGITUD_RADIOBASE'].astype(str)
+    )
+
+
+# Escribe un bloque en el archivo de distancias y en el de su grupo (el encabezado
+# solo en el primer bloque). Regresa cuántas filas quedaron en cada grupo.
+def escribir_bloque(bloque, primer_bloque, carpeta=".", sufijo=""):
+    modo = 'w' if primer_bloque else 'a'
+    bloque.to_csv(os.path.join(carpeta, ARCHIVO_DISTANCIAS + sufijo), mode=modo, header=primer_bloque, index=False)
+
+    conteos = {}
+    for grupo, archivo in GRUPOS.items():
+        df_grupo = bloque[bloque['grupo_distancia'] == grupo]
+        if grupo == '<=3 km':
+            df_grupo = df_grupo.assign(ruta_google_maps=rutas_google_maps(df_grupo))
+        df_grupo.to_csv(os.path.join(carpeta, archivo + sufijo), mode=modo, header=primer_bloque, index=False)
+        conteos[grupo] = len(df_grupo)
+    return conteos
+
+
+# Cambia los archivos escritos con sufijo por los definitivos (os.replace es atómico)
+def reemplazar_archivos(sufijo, carpeta="."):
+    for archivo in [ARCHIVO_DISTANCIAS, *GRUPOS.values()]:
+        ruta = os.path.join(carpeta, archivo)
+        os.replace(ruta + sufijo, ruta)
@@ -0,0 +1,125 @@
+import itertools
+import numpy as np
+
+from distancias import HOLGURA_RELATIVA, a_cartesianas, bloques_distancias, haversine_km, km_a_cuerda
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    # Sin scipy se usa la búsqueda exhaustiva por bloques (más lenta, mismo resultado)
+    cKDTree = None
+
+
+# Índice espacial sobre las coordenadas de las radiobases.
+# Se construye una sola vez y después se consulta en lote:
+#   - vecinos(puntos, k): las k radiobases más cercanas a cada punto
+#   - en_radio(puntos, radio_km): todas las radiobases a distancia <= radio_km
+#   - en_anillo(puntos, d_min, d_max): radiobases con d_min < distancia <= d_max
+#     (d_min con holgura relativa, para no devolver la radiobase que define d_min)
+# Todas las distancias son de gran círculo, en km.
+class IndiceRadiobases:
+    def __init__(self, coords, ids=None, tam_hoja=16, memoria_mb=256):
+        self.coords = np.ascontiguousarray(coords, dtype=float)
+        if self.coords.ndim != 2 or self.coords.shape[1] != 2:
+            raise ValueError("Las coordenadas deben tener forma (n, 2): lat, lng")
+        if len(self.coords) == 0:
+            raise ValueError("No hay radiobases para construir el índice.")
+
+        self.ids = np.asarray(ids) if ids is not None else None
+        self.memoria_mb = memoria_mb
+        # El árbol vive en la esfera unitaria (x, y, z) para que la distancia sea exacta
+        self.arbol = cKDTree(a_cartesianas(self.coords), leafsize=tam_hoja) if cKDTree is not None else None
+
+    def __len__(self):
+        return len(self.coords)
+
+    # Distancias (km), índices de forma (n, k), ordenados de menor a mayor
+    def vecinos(self, puntos, k=1):
+        puntos = self._como_matriz(puntos)
+        k = min(k, len(self.coords))
+
+        if self.arbol is not None:
+            _, indices = self.arbol.query(a_cartesianas(puntos), k=k)
+            if k == 1:
+                indices = indices[:, None]
+            # El árbol solo elige; la distancia se recalcula con haversine para que sea
+            # idéntica a la de haversine_km (la cuerda convertida difiere en el último bit)
+            distancias = haversine_km(puntos[:, 0:1], puntos[:, 1:2], self.coords[indices, 0], self.coords[indices, 1])
+            return distancias, indices
+
+        distancias = np.empty((len(puntos), k))
+        indices = np.empty((len(puntos), k), dtype=np.intp)
+        for inicio, d in bloques_distancias(puntos, self.coords, self.memoria_mb):
+            fin = inicio + len(d)
+            if k < d.shape[1]:
+                candidatos = np.argpartition(d, k - 1, axis=1)[:, :k]
+            else:
+                candidatos = np.broadcast_to(np.arange(d.shape[1]), d.shape)
+            d_candidatos = np.take_along_axis(d, candidatos, axis=1)
+            orden = np.argsort(d_candidatos, axis=1, kind="stable")
+            indices[inicio:fin] = np.take_along_axis(candidatos, orden, axis=1)
+            distancias[inicio:fin] = np.take_along_axis(d_candidatos, orden, axis=1)
+        return distancias, indices
+
+    # Lista con un arreglo de índices (ordenados) por cada punto
+    def en_radio(self, puntos, radio_km):
+        puntos = self._como_matriz(puntos)
+
+        if self.arbol is not None:
+            resultado = self.arbol.query_ball_point(
+                a_cartesianas(puntos), r=km_a_cuerda(radio_km), return_sorted=True
+            )
+            return [np.asarray(r, dtype=np.intp) for r in resultado]
+
+        resultado = []
+        for _, d in bloques_distancias(puntos, self.coords, self.memoria_mb):
+            filas, columnas = np.nonzero(d <= radio_km)
+            cortes = np.searchsorted(filas, np.arange(1, len(d)))
+            resultado.extend(np.split(columnas, cortes))
+        return resultado
+
+    # Radiobases dentro del anillo d_min < distancia <= d_max (radios por punto o escalares).
+    # El borde interior lleva HOLGURA_RELATIVA: la radiobase que está justo a d_min (la
+    # asignada) no entra aunque su distancia se haya calculado por otro camino.
+    # Regresa tres arreglos en formato largo, ordenados por punto y luego por distancia:
+    # fila del punto, índice de la radiobase y distancia en km.
+    def en_anillo(self, puntos, d_min, d_max):
+        puntos = self._como_matriz(puntos)
+        d_min = np.broadcast_to(np.asarray(d_min, dtype=float), len(puntos))
+        d_max = np.broadcast_to(np.asarray(d_max, dtype=float), len(puntos))
+
+        # Holgura mínima en el radio exterior; el corte exacto se hace abajo con haversine
+        if self.arbol is not None:
+            candidatos = self.arbol.query_ball_point(
+                a_cartesianas(puntos), r=km_a_cuerda(d_max) * (1 + HOLGURA_RELATIVA)
+            )
+            conteos = np.fromiter((len(c) for c in candidatos), dtype=np.intp, count=len(puntos))
+            filas = np.repeat(np.arange(len(puntos)), conteos)
+            indices = np.fromiter(itertools.chain.from_iterable(candidatos), dtype=np.intp, count=conteos.sum())
+        else:
+            filas, indices = [], []
+            for inicio, d in bloques_distancias(puntos, self.coords, self.memoria_mb):
+                f, c = np.nonzero(d <= d_max[inicio:inicio + len(d), None] * (1 + HOLGURA_RELATIVA))
+                filas.append(f + inicio)
+                indices.append(c)
+            filas = np.concatenate(filas) if filas else np.empty(0, dtype=np.intp)
+            indices = np.concatenate(indices) if indices else np.empty(0, dtype=np.intp)
+
+        distancias = haversine_km(puntos[filas, 0], puntos[filas, 1], self.coords[indices, 0], self.coords[indices, 1])
+        dentro = (distancias > d_min[filas] * (1 + HOLGURA_RELATIVA)) & (distancias <= d_max[filas])
+        filas, indices, distancias = filas[dentro], indices[dentro], distancias[dentro]
+
+        orden = np.lexsort((distancias, filas))
+        return filas[orden], indices[orden], distancias[orden]
+
+    # Identificadores de las radiobases para un arreglo de índices
+    def identificadores(self, indices):
+        if self.ids is None:
+            return np.asarray(indices)
+        return self.ids[indices]
+
+    def _como_matriz(self, puntos):
+        puntos = np.atleast_2d(np.asarray(puntos, dtype=float))
+        if puntos.shape[1] != 2:
+            raise ValueError("Los puntos deben tener forma (n, 2): lat, lng")
+        return puntos
@@ -0,0 +1,247 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from alternativas_lote import (
+    buscar_alternativas_lote,
+    columnas_alternativas,
+    guardar_alternativas_largo,
+    texto_alternativas,
+    top_k_desde_largo,
+)
+from cargador_muestreo import coordenadas_validas, leer_muestreo
+from distancias import distancia_pares_km
+from grupos_distancia import rutas_google_maps
+from indice_espacial import IndiceRadiobases
+
+# Análisis de cobertura de radiobases en un solo punto de entrada:
+#   cargar → limpiar → asignar → clasificar → alternativas → reporte
+# Cada etapa guarda su resultado en disco con una clave que depende del contenido
+# del archivo de entrada y de los parámetros de esa etapa y de las anteriores.
+# Si solo cambia el formato del reporte (k) no se recalcula nada; si cambian los
+# umbrales se reutilizan carga, limpieza y asignación.
+ETAPAS = ["cargar", "limpiar", "asignar", "clasificar", "alternativas", "reporte"]
+VERSION_CACHE = 3
+
+
+def hash_archivo(ruta, tam_bloque=2**20):
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(tam_bloque), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+# La clave de una etapa encadena la clave de la anterior con sus propios parámetros
+def clave_etapa(etapa, clave_anterior, **parametros):
+    contenido = json.dumps({
+        "etapa": etapa,
+        "version": VERSION_CACHE,
+        "anterior": clave_anterior,
+        "parametros": parametros,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()[:16]
+
+
+class CacheEtapas:
+    def __init__(self, directorio=".cache_cobertura", activa=True):
+        self.directorio = directorio
+        self.activa = activa
+
+    def ruta(self, etapa, clave):
+        return os.path.join(self.directorio, f"{etapa}-{clave}.pkl")
+
+    def obtener_o_calcular(self, etapa, clave, funcion):
+        ruta = self.ruta(etapa, clave)
+        if self.activa and os.path.exists(ruta):
+            print(f"♻️  {etapa}: resultado en caché ({clave})")
+            return pd.read_pickle(ruta)
+
+        inicio = time.perf_counter()
+        resultado = funcion()
+        print(f"⚙️  {etapa}: calculado en {time.perf_counter() - inicio:.2f} s")
+
+        if self.activa:
+            os.makedirs(self.directorio, exist_ok=True)
+            temporal = ruta + ".tmp"
+            pd.to_pickle(resultado, temporal)
+            os.replace(temporal, ruta)  # escritura atómica: nunca queda un archivo a medias
+        return resultado
+
+
+# ────────────────────────────────────────────────────────────────────
+# Etapas
+
+def etapa_cargar(entrada, tam_bloque):
+    return leer_muestreo(entrada, tam_bloque=tam_bloque, filtrar=False)
+
+
+def etapa_limpiar(df):
+    return df[coordenadas_validas(df)].reset_index(drop=True)
+
+
+def etapa_asignar(df):
+    df = df.copy()
+    df["distancia_km_calculada"] = distancia_pares_km(
+        df[["LAT_DECIMAL", "LON_DECIMAL"]].to_numpy(),
+        df[["LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"]].to_numpy(),
+    )
+    return df
+
+
+def etiquetas_grupos(umbral_cercano, umbral_lejano):
+    return [f"<={umbral_cercano:g} km", f"{umbral_cercano:g}-{umbral_lejano:g} km", f">{umbral_lejano:g} km"]
+
+
+# Encabezado de la columna de alternativas según el factor (1.5 → "+50%")
+def etiqueta_alternativas(factor):
+    return f"Alternativas (dentro de +{factor - 1:.0%})"
+
+
+def etapa_clasificar(df, umbral_cercano, umbral_lejano):
+    df = df.copy()
+    df["grupo_distancia"] = pd.cut(
+        df["distancia_km_calculada"],
+        bins=[-np.inf, umbral_cercano, umbral_lejano, np.inf],
+        labels=etiquetas_grupos(umbral_cercano, umbral_lejano),
+    )
+    return df
+
+
+def etapa_alternativas(df, umbral_cercano, umbral_lejano, factor):
+    lejanas = df[df["grupo_distancia"] == etiquetas_grupos(umbral_cercano, umbral_lejano)[2]]
+    radiobases = df.drop_duplicates(subset=["LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"])
+    indice = IndiceRadiobases(
+        radiobases[["LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"]].to_numpy(),
+        ids=radiobases["ID_RADIOBASE_CERCANA"].to_numpy(),
+    )
+    return buscar_alternativas_lote(
+        indice,
+        lejanas[["LAT_DECIMAL", "LON_DECIMAL"]].to_numpy(),
+        lejanas["distancia_km_calculada"].to_numpy(),
+        factor=factor,
+        ids_comunidad=lejanas["LLAVE"].to_numpy(),
+        excluir_ids=lejanas["ID_RADIOBASE_CERCANA"].to_numpy(),
+    )
+
+
+def etapa_reporte(df, largo, umbral_cercano, umbral_lejano, factor, k, salida):
+    os.makedirs(salida, exist_ok=True)
+    cercano, medio, lejano = etiquetas_grupos(umbral_cercano, umbral_lejano)
+    columna_alternativas = etiqueta_alternativas(factor)
+
+    df_menor = df[df["grupo_distancia"] == cercano].copy()
+    df_entre = df[df["grupo_distancia"] == medio]
+    df_mayor = df[df["grupo_distancia"] == lejano]
+
+    df_menor["ruta_google_maps"] = rutas_google_maps(df_menor)
+
+    # Resumen legible (una fila por comunidad lejana)
+    distancia_actual = df_mayor["distancia_km_calculada"].to_numpy()
+    df_resumen = pd.DataFrame({
+        "ID comunidad": df_mayor["LLAVE"].to_numpy(),
+        "Comunidad": df_mayor["NOM_LOC"].to_numpy(),
+        "Punto actual más cercano": (
+            "(" + df_mayor["LATITUD_RADIOBASE"].map("{:.5f}".format)
+            + ", " + df_mayor["LONGITUD_RADIOBASE"].map("{:.5f}".format) + ")"
+        ).to_numpy(),
+        "ID radio actual": df_mayor["ID_RADIOBASE_CERCANA"].to_numpy(),
+        "Distancia actual (km)": [f"{d:.2f} km" for d in distancia_actual],
+        columna_alternativas: texto_alternativas(largo, len(df_mayor)).to_numpy(),
+    })
+    sin_alternativas = df_resumen[columna_alternativas] == "—"
+
+    # Tabla con las k alternativas más cercanas en columnas
+    top = top_k_desde_largo(largo, df_resumen["ID comunidad"].to_numpy(), k=k)
+    df_completo = df_resumen.drop(columns=[columna_alternativas]).assign(
+        **{"Coordenadas Comunidad": [f"({lat:.5f}, {lon:.5f})" for lat, lon in
+                                     zip(df_mayor["LAT_DECIMAL"], df_mayor["LON_DECIMAL"])]},
+        **columnas_alternativas(top, df_mayor["LAT_DECIMAL"].to_numpy(), df_mayor["LON_DECIMAL"].to_numpy()),
+    )[~sin_alternativas.to_numpy()]
+
+    archivos = {
+        "muestreo_con_distancias.csv": df,
+        f"comunidades_menor_{umbral_cercano:g}km.csv": df_menor,
+        f"comunidades_entre_{umbral_cercano:g}_{umbral_lejano:g}km.csv": df_entre,
+        f"comunidades_mayor_{umbral_lejano:g}km.csv": df_mayor,
+        "resumen_alternativas_legibles.csv": df_resumen,
+        "resumen_con_alternativas.csv": df_resumen[~sin_alternativas],
+        "resumen_sin_alternativas.csv": df_resumen[sin_alternativas],
+        f"resumen_con_{k}_alternativas_completo.csv": df_completo,
+    }
+    for nombre, tabla in archivos.items():
+        tabla.to_csv(os.path.join(salida, nombre), index=False)
+    archivos[guardar_alternativas_largo(largo, os.path.join(salida, "alternativas_largo.parquet"))] = largo
+
+    print(f"\n📂 {cercano}: {len(df_menor)} | {medio}: {len(df_entre)} | {lejano}: {len(df_mayor)}")
+    print(f"✅ Con alternativas: {(~sin_alternativas).sum()} | ❌ Sin alternativas: {sin_alternativas.sum()}")
+    print("\n📁 Archivos guardados:")
+    for nombre in archivos:
+        print(f" - {nombre}")
+
+
+# ────────────────────────────────────────────────────────────────────
+
+def ejecutar(args):
+    cache = CacheEtapas(args.cache, activa=not args.sin_cache)
+    ultima = ETAPAS.index(args.hasta)
+
+    clave = clave_etapa("cargar", hash_archivo(args.entrada))
+    df = cache.obtener_o_calcular("cargar", clave, lambda: etapa_cargar(args.entrada, args.tam_bloque))
+    print(f"✅ Total de registros cargados: {len(df)}")
+    if ultima == 0:
+        return
+
+    clave = clave_etapa("limpiar", clave)
+    df = cache.obtener_o_calcular("limpiar", clave, lambda: etapa_limpiar(df))
+    print(f"✅ Registros con coordenadas válidas: {len(df)}")
+    if ultima == 1:
+        return
+
+    clave = clave_etapa("asignar", clave)
+    df = cache.obtener_o_calcular("asignar", clave, lambda: etapa_asignar(df))
+    if ultima == 2:
+        return
+
+    clave = clave_etapa("clasificar", clave, cercano=args.umbral_cercano, lejano=args.umbral_lejano)
+    df = cache.obtener_o_calcular(
+        "clasificar", clave, lambda: etapa_clasificar(df, args.umbral_cercano, args.umbral_lejano)
+    )
+    if ultima == 3:
+        return
+
+    clave = clave_etapa("alternativas", clave, factor=args.factor)
+    largo = cache.obtener_o_calcular(
+        "alternativas", clave,
+        lambda: etapa_alternativas(df, args.umbral_cercano, args.umbral_lejano, args.factor),
+    )
+    if ultima == 4:
+        return
+
+    # El reporte siempre se escribe: es barato y depende solo de resultados en caché
+    etapa_reporte(df, largo, args.umbral_cercano, args.umbral_lejano, args.factor, args.k, args.salida)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cobertura de radiobases con etapas en caché")
+    parser.add_argument("--entrada", default="Muestreo - Hoja1.csv")
+    parser.add_argument("--salida", default=".", help="Carpeta para los CSV del reporte")
+    parser.add_argument("--tam-bloque", type=int, default=200_000, help="Filas por bloque al leer la entrada")
+    parser.add_argument("--cache", default=".cache_cobertura", help="Carpeta de la caché de etapas")
+    parser.add_argument("--sin-cache", action="store_true", help="Recalcular todo sin leer ni escribir caché")
+    parser.add_argument("--umbral-cercano", type=float, default=3, help="km")
+    parser.add_argument("--umbral-lejano", type=float, default=30, help="km")
+    parser.add_argument("--factor", type=float, default=1.5, help="Alternativas hasta distancia actual × factor")
+    parser.add_argument("-k", type=int, default=3, help="Alternativas por comunidad en el reporte")
+    parser.add_argument("--hasta", choices=ETAPAS, default="reporte", help="Última etapa a ejecutar")
+    ejecutar(parser.parse_args())
+    print("\n✅ ¡Listo!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import numpy as np
+import pandas as pd
+
+from alternativas_lote import buscar_alternativas_lote, guardar_alternativas_largo, leer_alternativas_largo
+from grupos_distancia import ARCHIVO_DISTANCIAS, GRUPO_LEJANO, clasificar, escribir_bloque, reemplazar_archivos
+from indice_espacial import IndiceRadiobases
+
+# Actualiza las salidas de localidades.py cuando cambia el inventario de radiobases,
+# sin recalcular todas las comunidades. El archivo de cambios es un CSV con columnas
+#   accion (alta | baja), ID_RADIOBASE, LATITUD, LONGITUD
+# (para las bajas basta el ID). Una comunidad se reasigna solo si:
+#   - su radiobase actual fue dada de baja, o
+#   - alguna radiobase nueva queda más cerca que la actual.
+# Las alternativas (>30 km) se recalculan solo para las comunidades reasignadas, las que
+# tenían como alternativa una radiobase dada de baja y las que tienen una radiobase
+# nueva dentro de su anillo (actual, actual × factor].
+COLUMNAS_RADIOBASE = ["ID_RADIOBASE_CERCANA", "LATITUD_RADIOBASE", "LONGITUD_RADIOBASE"]
+
+
+def leer_cambios(ruta):
+    cambios = pd.read_csv(ruta)
+    accion = cambios["accion"].str.strip().str.lower()
+    desconocidas = set(accion) - {"alta", "baja"}
+    if desconocidas:
+        raise ValueError(f"Acciones no reconocidas en {ruta}: {sorted(desconocidas)}")
+
+    altas = cambios.loc[accion == "alta", ["ID_RADIOBASE", "LATITUD", "LONGITUD"]]
+    altas = altas.rename(columns=dict(zip(["ID_RADIOBASE", "LATITUD", "LONGITUD"], COLUMNAS_RADIOBASE)))
+    if altas[COLUMNAS_RADIOBASE[1:]].isna().any().any():
+        raise ValueError("Todas las altas deben tener LATITUD y LONGITUD.")
+    bajas = set(cambios.loc[accion == "baja", "ID_RADIOBASE"])
+    return altas.reset_index(drop=True), bajas
+
+
+# Radiobases únicas por coordenada a partir del archivo de distancias (solo 3 columnas)
+def inventario_desde_muestreo(ruta, tam_bloque=200_000):
+    partes = [
+        bloque.drop_duplicates(subset=COLUMNAS_RADIOBASE[1:])
+        for bloque in pd.read_csv(ruta, usecols=COLUMNAS_RADIOBASE, chunksize=tam_bloque)
+    ]
+    return pd.concat(partes).drop_duplicates(subset=COLUMNAS_RADIOBASE[1:]).reset_index(drop=True)
+
+
+class ReasignadorIncremental:
+    def __init__(self, inventario, altas, bajas, factor=1.5):
+        vigentes = inventario[~inventario["ID_RADIOBASE_CERCANA"].isin(bajas)]
+        nuevo = pd.concat([vigentes, altas], ignore_index=True)
+        self.indice = IndiceRadiobases(nuevo[COLUMNAS_RADIOBASE[1:]].to_numpy(),
+                                       ids=nuevo["ID_RADIOBASE_CERCANA"].to_numpy())
+        self.indice_altas = None
+        if len(altas):
+            self.indice_altas = IndiceRadiobases(altas[COLUMNAS_RADIOBASE[1:]].to_numpy(),
+                                                 ids=altas["ID_RADIOBASE_CERCANA"].to_numpy())
+        self.bajas = bajas
+        self.factor = factor
+
+    # Reasigna en el bloque solo las comunidades afectadas; regresa la máscara de reasignadas
+    def actualizar_bloque(self, bloque):
+        coords = bloque[["LAT_DECIMAL", "LON_DECIMAL"]].to_numpy()
+        distancia = bloque["distancia_km_calculada"].to_numpy()
+
+        # copy=True: con copy-on-write (pandas 3) to_numpy() da una vista de solo lectura
+        afectadas = bloque["ID_RADIOBASE_CERCANA"].isin(self.bajas).to_numpy(copy=True)
+        if self.indice_altas is not None:
+            d_alta, _ = self.indice_altas.vecinos(coords, k=1)
+            afectadas |= d_alta[:, 0] < distancia
+
+        if afectadas.any():
+            d, idx = self.indice.vecinos(coords[afectadas], k=1)
+            idx = idx[:, 0]
+            bloque.loc[afectadas, "ID_RADIOBASE_CERCANA"] = self.indice.identificadores(idx)
+            bloque.loc[afectadas, "LATITUD_RADIOBASE"] = self.indice.coords[idx, 0]
+            bloque.loc[afectadas, "LONGITUD_RADIOBASE"] = self.indice.coords[idx, 1]
+            bloque.loc[afectadas, "distancia_km_calculada"] = d[:, 0]
+            bloque.loc[afectadas, "grupo_distancia"] = np.asarray(clasificar(d[:, 0]), dtype=object)
+        return afectadas
+
+    # Comunidades lejanas del bloque cuyas alternativas pueden haber cambiado
+    def alternativas_afectadas(self, bloque, reasignadas, comunidades_con_bajas):
+        lejanas = (bloque["grupo_distancia"] == GRUPO_LEJANO).to_numpy()
+        recalcular = reasignadas | bloque["LLAVE"].isin(comunidades_con_bajas).to_numpy(copy=True)
+
+        if self.indice_altas is not None and lejanas.any():
+            distancia = bloque["distancia_km_calculada"].to_numpy()[lejanas]
+            filas, _, _ = self.indice_altas.en_anillo(
+                bloque.loc[lejanas, ["LAT_DECIMAL", "LON_DECIMAL"]].to_numpy(), distancia, distancia * self.factor
+            )
+            recalcular[np.flatnonzero(lejanas)[filas]] = True
+        return recalcular & lejanas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reasignación incremental por altas/bajas de radiobases")
+    parser.add_argument("cambios", help="CSV con accion, ID_RADIOBASE, LATITUD, LONGITUD")
+    parser.add_argument("--entrada", default=ARCHIVO_DISTANCIAS)
+    parser.add_argument("--alternativas", default="alternativas_largo.parquet")
+    parser.add_argument("--factor", type=float, default=1.5)
+    parser.add_argument("--tam-bloque", type=int, default=200_000)
+    args = parser.parse_args()
+
+    altas, bajas = leer_cambios(args.cambios)
+    print(f"📥 Cambios: {len(altas)} altas, {len(bajas)} bajas")
+
+    reasignador = ReasignadorIncremental(inventario_desde_muestreo(args.entrada, args.tam_bloque),
+                                         altas, bajas, args.factor)
+    largo = leer_alternativas_largo(args.alternativas)
+    comunidades_con_bajas = set(largo.loc[largo["id_radiobase"].isin(bajas), "id_comunidad"])
+
+    total_reasignadas = 0
+    total_recalculadas = 0
+    descartar = set()
+    nuevas_alternativas = []
+    orden_lejanas = []
+
+    # Se reescriben los archivos por bloques; solo las filas afectadas pasan por el índice
+    for i, bloque in enumerate(pd.read_csv(args.entrada, chunksize=args.tam_bloque)):
+        reasignadas = reasignador.actualizar_bloque(bloque)
+        recalcular = reasignador.alternativas_afectadas(bloque, reasignadas, comunidades_con_bajas)
+
+        descartar.update(bloque.loc[reasignadas | recalcular, "LLAVE"])
+        if recalcular.any():
+            afectadas = bloque[recalcular]
+            nuevas_alternativas.append(buscar_alternativas_lote(
+                reasignador.indice,
+                afectadas[["LAT_DECIMAL", "LON_DECIMAL"]].to_numpy(),
+                afectadas["distancia_km_calculada"].to_numpy(),
+                factor=args.factor,
+                ids_comunidad=afectadas["LLAVE"].to_numpy(),
+                # distancia_km_calculada viene del CSV y puede no coincidir bit a bit con la
+                # que da el índice; la radiobase asignada se descarta por ID
+                excluir_ids=afectadas["ID_RADIOBASE_CERCANA"].to_numpy(),
+            ))
+        orden_lejanas.extend(bloque.loc[bloque["grupo_distancia"] == GRUPO_LEJANO, "LLAVE"])
+
+        escribir_bloque(bloque, primer_bloque=(i == 0), sufijo=".tmp")
+        total_reasignadas += int(reasignadas.sum())
+        total_recalculadas += int(recalcular.sum())
+
+    reemplazar_archivos(".tmp")
+
+    # Alternativas: se conservan las que no cambiaron y se agregan las recalculadas,
+    # en el mismo orden que comunidades_mayor_30km.csv
+    largo = pd.concat([largo[~largo["id_comunidad"].isin(descartar)], *nuevas_alternativas], ignore_index=True)
+    largo["fila"] = pd.Index(orden_lejanas).get_indexer(largo["id_comunidad"])
+    largo = largo[largo["fila"] >= 0].sort_values(["fila", "rango"], kind="stable")
+    ruta_largo = guardar_alternativas_largo(largo, args.alternativas)
+
+    print(f"✅ Comunidades reasignadas: {total_reasignadas}")
+    print(f"✅ Comunidades con alternativas recalculadas: {total_recalculadas}")
+    print(f"📁 Actualizados: {ARCHIVO_DISTANCIAS}, comunidades_*km.csv, {ruta_largo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,103 @@
+import argparse
+import os
+import sys
 import pandas as pd
 import numpy as np
 
-# Leer archivos
-df1 = pd.read_csv('muestreo_localidades.csv', header=None, names=['lat', 'lng'], dtype=float)
-df2 = pd.read_csv('muestreo_radiobases.csv', header=None, names=['lat', 'lng'], dtype=float)
-
-coords1 = df1[['lat', 'lng']].to_numpy()
-coords2 = df2[['lat', 'lng']].to_numpy()
-
-# Crear matriz para guardar pares
-pares = []
-for coord1 in coords1:
-    # Distancia euclidiana entre coord1 y todas en coords2
-    distancias = np.linalg.norm(coords2 - coord1, axis=1)
-    idx_min = np.argmin(distancias)
-    coord2 = coords2[idx_min]
-    pares.append([coord1[0], coord1[1], coord2[0], coord2[1], distancias[idx_min]])
-
-# Guardar en CSV
-df_pares = pd.DataFrame(pares, columns=['lat1', 'lng1', 'lat2', 'lng2', 'distancia_grados'])
-df_pares.to_csv('pares_mas_cercanos.csv', index=False)
-
-print(df_pares)
-
-df_pares['distancia_km'] = df_pares['distancia_grados'] * 111.32
-#imprimir las distnacias en km
-print(df_pares[['lat1', 'lng1', 'lat2', 'lng2', 'distancia_km']])
-# imprimir las distnacias mas lejanas
-print(df_pares[['lat1', 'lng1', 'lat2', 'lng2', 'distancia_km']].sort_values(by='distancia_km', ascending=False).head(10))
-
-# Estadísticas básicas
-print(df_pares['distancia_km'].describe())
-
-# Porcentiles específicos
-percentiles = [10, 25, 50, 75, 90, 95, 99]
-valores_percentiles = np.percentile(df_pares['distancia_km'], percentiles)
-for p, v in zip(percentiles, valores_percentiles):
-    print(f"{p} percentil: {v:.2f} km")
-
-# Umbral de confianza basado en el percentil 75
-umbral_confianza_km = 12.89
-
-# Filtrar los datos
-df_cercanas = df_pares[df_pares['distancia_km'] <= umbral_confianza_km]
-df_lejanas = df_pares[df_pares['distancia_km'] > umbral_confianza_km]
-
-# Guardar a archivos CSV
-df_cercanas.to_csv('distancias_cercanas.csv', index=False)
-df_lejanas.to_csv('distancias_lejanas.csv', index=False)
-
-# Imprimir cuántas hay en cada grupo
-print(f"Número de distancias cercanas (<= {umbral_confianza_km} km):", len(df_cercanas))
-print(f"Número de distancias lejanas  (> {umbral_confianza_km} km):", len(df_lejanas))
\ No newline at end of file
+# Los módulos compartidos de radiobases viven en JoseLuis/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "JoseLuis"))
+from asignacion_paralela import AsignadorParalelo
+from cuantiles_streaming import ParticionPorDistancia, SketchCuantiles
+from indice_espacial import IndiceRadiobases
+
+
+TAM_BLOQUE = 1_000_000
+PERCENTILES = [10, 25, 50, 75, 90, 95, 99]
+COLUMNAS = ['lat1', 'lng1', 'lat2', 'lng2', 'distancia_km']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Radiobase más cercana para cada localidad")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Procesos para la asignación (0 = todos los núcleos; "
+                             "con 1, el valor por defecto, se asigna en serie sin pool de procesos)")
+    parser.add_argument("--percentil-umbral", type=float, default=75,
+                        help="Percentil de la distancia que separa cercanas de lejanas")
+    parser.add_argument("--tam-bloque", type=int, default=TAM_BLOQUE,
+                        help="Localidades por bloque (acota la memoria)")
+    args = parser.parse_args()
+
+    # Las radiobases se cargan completas; las localidades se leen por bloques
+    df2 = pd.read_csv('muestreo_radiobases.csv', header=None, names=['lat', 'lng'], dtype=float)
+    coords2 = df2[['lat', 'lng']].to_numpy()
+    # El índice (y, con --workers, el pool con las radiobases en memoria compartida)
+    # se construye una sola vez y se reutiliza en todos los bloques
+    indice = IndiceRadiobases(coords2)
+    asignador = AsignadorParalelo(indice, trabajadores=args.workers or None, capacidad=args.tam_bloque)
+    if asignador.en_serie:
+        print("⚙️ Asignación en serie (usa --workers 0 o mayor que 1 para repartir entre procesos)")
+    else:
+        print(f"⚙️ Asignación con {asignador.trabajadores} procesos")
+
+    # En una sola pasada: se escriben los pares, se alimenta el sketch de cuantiles
+    # y cada fila se reparte en cubetas por distancia para separar al final
+    sketch = SketchCuantiles()
+    mas_lejanas = None
+    bloques = pd.read_csv('muestreo_localidades.csv', header=None, names=['lat', 'lng'], dtype=float,
+                          chunksize=args.tam_bloque)
+
+    with asignador, ParticionPorDistancia(COLUMNAS, carpeta='.') as particion:
+        for i, df1 in enumerate(bloques):
+            coords1 = df1[['lat', 'lng']].to_numpy()
+
+            # Radiobase más cercana para todas las localidades (distancia en km), usando el
+            # índice espacial; con --workers > 1 las localidades se reparten entre procesos
+            distancias, idx_min = asignador.asignar(coords1)
+            coords_cercanas = coords2[idx_min]
+
+            df_pares = pd.DataFrame({
+                'lat1': coords1[:, 0],
+                'lng1': coords1[:, 1],
+                'lat2': coords_cercanas[:, 0],
+                'lng2': coords_cercanas[:, 1],
+                'distancia_km': distancias,
+            })
+            df_pares.to_csv('pares_mas_cercanos.csv', mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+            sketch.actualizar(distancias)
+            particion.agregar(df_pares)
+            candidatas = df_pares.nlargest(10, 'distancia_km')
+            if mas_lejanas is not None:
+                candidatas = pd.concat([mas_lejanas, candidatas])
+            mas_lejanas = candidatas.nlargest(10, 'distancia_km')
+
+            #imprimir las distnacias en km (primer bloque)
+            if i == 0:
+                print(df_pares[COLUMNAS])
+
+        # imprimir las distnacias mas lejanas
+        print(mas_lejanas.reset_index(drop=True))
+
+        # Estadísticas básicas
+        print(sketch.describir())
+
+        # Porcentiles específicos (aproximados, error de rango ~1/k del sketch)
+        valores_percentiles = sketch.cuantiles(np.array(PERCENTILES) / 100)
+        for p, v in zip(PERCENTILES, valores_percentiles):
+            print(f"{p} percentil: {v:.2f} km")
+
+        # Umbral de confianza basado en el percentil elegido
+        umbral_confianza_km = round(float(sketch.cuantiles(args.percentil_umbral / 100)), 2)
+
+        # Separar y guardar a archivos CSV (sin volver a leer las localidades)
+        conteos = particion.dividir(umbral_confianza_km, 'distancias_cercanas.csv', 'distancias_lejanas.csv')
+
+    # Imprimir cuántas hay en cada grupo
+    print(f"Umbral de confianza (percentil {args.percentil_umbral:g}): {umbral_confianza_km} km")
+    print(f"Número de distancias cercanas (<= {umbral_confianza_km} km):", conteos['cercanas'])
+    print(f"Número de distancias lejanas  (> {umbral_confianza_km} km):", conteos['lejanas'])
+
+
+# El guardia es necesario para que los procesos trabajadores no vuelvan a ejecutar el script
+if __name__ == "__main__":
+    main()
@@ -1,87 +1,103 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 
-print("📥 Cargando el archivo CSV original...")
-df = pd.read_csv("Muestreo - Hoja1.csv", encoding='latin1')
-
-print(f"✅ Total de registros cargados: {len(df)}")
-print(df.head(2))
-
-# Filtrar filas con coordenadas válidas
-df = df.dropna(subset=['LAT_DECIMAL', 'LON_DECIMAL', 'LATITUD_RADIOBASE', 'LONGITUD_RADIOBASE'])
-print(f"✅ Registros con coordenadas válidas: {len(df)}")
-print(df.head(2))
-
-# Calcular distancia euclidiana en km
-coord_comunidades = df[['LAT_DECIMAL', 'LON_DECIMAL']].to_numpy()
-coord_asignadas = df[['LATITUD_RADIOBASE', 'LONGITUD_RADIOBASE']].to_numpy()
-distancias = np.linalg.norm(coord_comunidades - coord_asignadas, axis=1) * 111.32
-df['distancia_km_calculada'] = distancias
+# Los módulos compartidos de radiobases viven en JoseLuis/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "JoseLuis"))
+from alternativas_lote import buscar_alternativas_lote, guardar_alternativas_largo, texto_alternativas
+from cargador_muestreo import coordenadas_validas, leer_muestreo_por_bloques
+from distancias import distancia_pares_km
+from grupos_distancia import GRUPO_LEJANO, GRUPOS, clasificar, escribir_bloque
+from indice_espacial import IndiceRadiobases
+
+# El archivo se procesa por bloques para que la memoria no dependa de su tamaño.
+# Solo las comunidades >30 km y las radiobases únicas se guardan completas.
+# Se conservan todas las columnas de la hoja en los CSV de salida; estas llevan tipo
+# explícito (POB_TOTAL es un conteo: entero con nulos, no categoría).
+TAM_BLOQUE = 200_000
+OTRAS_COLUMNAS = {"NOM_ENT": "category", "NOM_MUN": "category", "POB_TOTAL": "Int64"}
+
+print("📥 Leyendo el archivo CSV original por bloques...")
+total_registros = 0
+conteos = dict.fromkeys(GRUPOS, 0)
+distancias = []
+lejanas = []
+radiobases = []
+primer_bloque = True
+
+for bloque in leer_muestreo_por_bloques("Muestreo - Hoja1.csv", TAM_BLOQUE, OTRAS_COLUMNAS, filtrar=False,
+                                    todas=True):
+    total_registros += len(bloque)
+
+    # Filtrar filas con coordenadas válidas
+    bloque = bloque[coordenadas_validas(bloque)].copy()
+
+    # Calcular distancia de gran círculo en km
+    bloque['distancia_km_calculada'] = distancia_pares_km(
+        bloque[['LAT_DECIMAL', 'LON_DECIMAL']].to_numpy(),
+        bloque[['LATITUD_RADIOBASE', 'LONGITUD_RADIOBASE']].to_numpy()
+    )
+
+    # Clasificar por grupos de distancia
+    bloque['grupo_distancia'] = clasificar(bloque['distancia_km_calculada'])
+
+    # Escribir el bloque en cada archivo de salida (con enlace de Google Maps para <= 3 km)
+    for grupo, total in escribir_bloque(bloque, primer_bloque).items():
+        conteos[grupo] += total
+
+    distancias.append(bloque['distancia_km_calculada'].to_numpy(dtype=np.float32))
+    lejanas.append(bloque[bloque['grupo_distancia'] == GRUPO_LEJANO])
+    radiobases.append(bloque[['ID_RADIOBASE_CERCANA', 'LATITUD_RADIOBASE', 'LONGITUD_RADIOBASE']]
+                      .drop_duplicates(subset=['LATITUD_RADIOBASE', 'LONGITUD_RADIOBASE']))
+    primer_bloque = False
+
+print(f"✅ Total de registros leídos: {total_registros}")
+print(f"✅ Registros con coordenadas válidas: {sum(conteos.values())}")
 
 print("\n📊 Estadísticas de distancia a radiobase asignada:")
-print(df['distancia_km_calculada'].describe())
-print(df[['NOM_LOC', 'LAT_DECIMAL', 'LON_DECIMAL', 'distancia_km_calculada']].head(2))
-
-# Clasificar por grupos de distancia
-df['grupo_distancia'] = pd.cut(
-    df['distancia_km_calculada'],
-    bins=[-np.inf, 3, 30, np.inf],
-    labels=['<=3 km', '3-30 km', '>30 km']
-)
+print(pd.Series(np.concatenate(distancias), name='distancia_km_calculada').describe())
 
-# Separar los tres grupos
-df_menor_3 = df[df['grupo_distancia'] == '<=3 km']
-df_entre_3_30 = df[df['grupo_distancia'] == '3-30 km']
-df_mayor_30 = df[df['grupo_distancia'] == '>30 km']
+for grupo, total in conteos.items():
+    print(f"📂 Comunidades {grupo}: {total}")
 
-print(f"\n📂 Comunidades <=3 km: {len(df_menor_3)}")
-print(df_menor_3[['NOM_LOC', 'distancia_km_calculada']].head(2))
-
-print(f"\n📂 Comunidades entre 3 y 30 km: {len(df_entre_3_30)}")
-print(df_entre_3_30[['NOM_LOC', 'distancia_km_calculada']].head(2))
-
-print(f"\n📂 Comunidades >30 km: {len(df_mayor_30)}")
+df_mayor_30 = pd.concat(lejanas, ignore_index=True)
 print(df_mayor_30[['NOM_LOC', 'distancia_km_calculada']].head(2))
 
 # Buscar alternativas para comunidades lejanas (>30 km)
-coords_radiobases = df[['LATITUD_RADIOBASE', 'LONGITUD_RADIOBASE']].drop_duplicates().to_numpy()
-resumen = []
+# Radiobases únicas por coordenada; su ID es el de la primera fila donde aparecen
+radiobases = pd.concat(radiobases).drop_duplicates(subset=['LATITUD_RADIOBASE', 'LONGITUD_RADIOBASE'])
+indice = IndiceRadiobases(
+    radiobases[['LATITUD_RADIOBASE', 'LONGITUD_RADIOBASE']].to_numpy(),
+    ids=radiobases['ID_RADIOBASE_CERCANA'].to_numpy()
+)
 
 print("\n🔎 Buscando alternativas para comunidades con distancia >30 km...")
 
-for _, fila in df_mayor_30.iterrows():
-    lat1, lng1 = fila['LAT_DECIMAL'], fila['LON_DECIMAL']
-    lat2, lng2 = fila['LATITUD_RADIOBASE'], fila['LONGITUD_RADIOBASE']
-    distancia_actual = fila['distancia_km_calculada']
-    id_radiobase_actual = fila['ID_RADIOBASE_CERCANA']
-    comunidad = fila['NOM_LOC']
-    coord1 = np.array([lat1, lng1])
-    limite_superior = distancia_actual * 1.5
-
-    distancias_alt = np.linalg.norm(coords_radiobases - coord1, axis=1) * 111.32
-    alternativas = []
-
-    for i, d in enumerate(distancias_alt):
-        alt_lat, alt_lng = coords_radiobases[i]
-        if distancia_actual < d <= limite_superior:
-            match = df[
-                (df['LATITUD_RADIOBASE'] == alt_lat) &
-                (df['LONGITUD_RADIOBASE'] == alt_lng)
-            ]
-            id_alt = match['ID_RADIOBASE_CERCANA'].iloc[0] if not match.empty else "N/D"
-            alternativas.append(f"{id_alt} ({alt_lat:.5f}, {alt_lng:.5f}) → {d:.2f} km")
-
-    resumen.append({
-        "Comunidad": comunidad,
-        "Punto actual más cercano": f"({lat2:.5f}, {lng2:.5f})",
-        "ID radio actual": id_radiobase_actual,
-        "Distancia actual (km)": f"{distancia_actual:.2f} km",
-        "Alternativas (dentro de +50%)": "; ".join(alternativas) if alternativas else "—"
-    })
-
-print(f"\n✅ Total de comunidades analizadas: {len(resumen)}")
-
-df_resumen = pd.DataFrame(resumen)
+# Anillo actual < d <= actual * 1.5 para todas las comunidades en una sola consulta
+distancia_actual = df_mayor_30['distancia_km_calculada'].to_numpy()
+alternativas = buscar_alternativas_lote(
+    indice,
+    df_mayor_30[['LAT_DECIMAL', 'LON_DECIMAL']].to_numpy(),
+    distancia_actual,
+    ids_comunidad=df_mayor_30['LLAVE'].to_numpy(),
+    excluir_ids=df_mayor_30['ID_RADIOBASE_CERCANA'].to_numpy()
+)
+
+df_resumen = pd.DataFrame({
+    "ID comunidad": df_mayor_30['LLAVE'].to_numpy(),
+    "Comunidad": df_mayor_30['NOM_LOC'].to_numpy(),
+    "Punto actual más cercano": (
+        "(" + df_mayor_30['LATITUD_RADIOBASE'].map("{:.5f}".format)
+        + ", " + df_mayor_30['LONGITUD_RADIOBASE'].map("{:.5f}".format) + ")"
+    ).to_numpy(),
+    "ID radio actual": df_mayor_30['ID_RADIOBASE_CERCANA'].to_numpy(),
+    "Distancia actual (km)": [f"{d:.2f} km" for d in distancia_actual],
+    "Alternativas (dentro de +50%)": texto_alternativas(alternativas, len(df_mayor_30)).to_numpy(),
+})
+
+print(f"\n✅ Total de comunidades analizadas: {len(df_resumen)}")
+
 print("\n📋 Vista previa del resumen:")
 print(df_resumen.head(2))
 
@@ -94,25 +110,11 @@ print(df_con_alternativas.head(2))
 print(f"\n❌ Sin alternativas: {len(df_sin_alternativas)}")
 print(df_sin_alternativas.head(2))
 
-
-# ruta de gogolke maps
-# Crear columna con enlace de Google Maps para las comunidades <= 3 km
-df_menor_3['ruta_google_maps'] = df_menor_3.apply(
-    lambda fila: f"https://www.google.com/maps/dir/{fila['LAT_DECIMAL']},{fila['LON_DECIMAL']}/{fila['LATITUD_RADIOBASE']},{fila['LONGITUD_RADIOBASE']}",
-    axis=1
-)
-
-print("\n🌐 Muestra de enlaces de ruta en Google Maps para comunidades <= 3 km:")
-print(df_menor_3[['NOM_LOC', 'ruta_google_maps']].head(3))
-
-# Guardar archivos
-df.to_csv("muestreo_con_distancias.csv", index=False)
-df_menor_3.to_csv("comunidades_menor_3km.csv", index=False)
-df_entre_3_30.to_csv("comunidades_entre_3_30km.csv", index=False)
-df_mayor_30.to_csv("comunidades_mayor_30km.csv", index=False)
+# Guardar archivos (los de distancias y grupos ya se escribieron por bloques)
 df_resumen.to_csv("resumen_alternativas_legibles.csv", index=False)
 df_con_alternativas.to_csv("resumen_con_alternativas.csv", index=False)
 df_sin_alternativas.to_csv("resumen_sin_alternativas.csv", index=False)
+ruta_largo = guardar_alternativas_largo(alternativas, "alternativas_largo.parquet")
 
 print("\n📁 Archivos guardados:")
 print(" - muestreo_con_distancias.csv")
@@ -122,5 +124,6 @@ print(" - comunidades_mayor_30km.csv")
 print(" - resumen_alternativas_legibles.csv")
 print(" - resumen_con_alternativas.csv")
 print(" - resumen_sin_alternativas.csv")
+print(f" - {ruta_largo}")
 
-print("\n✅ ¡Listo!")
\ No newline at end of file
+print("\n✅ ¡Listo!")
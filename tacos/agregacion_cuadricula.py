@@ -0,0 +1,133 @@
+import json
+
+import folium
+import numpy as np
+import pandas as pd
+from branca.element import MacroElement
+from jinja2 import Template
+
+from crawler_places import BBOX_CDMX
+
+# Agregación de taquerías por celda de una cuadrícula sobre el bbox.
+# La celda de cada lugar sale de aritmética entera sobre los arreglos lat/lng
+# (floor((lat - lat_min) / paso)), y conteo, rating promedio y mezcla de niveles de
+# precio se calculan en un solo groupby. El resultado se dibuja como coropletas,
+# que sustituyen a los marcadores cuando el mapa está alejado.
+SIN_PRECIO = "SIN_PRECIO"
+
+
+# Índices (i, j) de celda para cada punto; -1 si queda fuera del bbox
+def indices_celda(lat, lng, bbox=BBOX_CDMX, grid_size=10):
+    lat_min, lng_min, lat_max, lng_max = bbox
+    lat = np.asarray(lat, dtype=float)
+    lng = np.asarray(lng, dtype=float)
+    i = np.floor((lat - lat_min) / ((lat_max - lat_min) / grid_size))
+    j = np.floor((lng - lng_min) / ((lng_max - lng_min) / grid_size))
+    # El borde norte/este pertenece a la última celda
+    i = np.where(lat == lat_max, grid_size - 1, i)
+    j = np.where(lng == lng_max, grid_size - 1, j)
+    fuera = ~((i >= 0) & (i < grid_size) & (j >= 0) & (j < grid_size))  # también NaN
+    i = np.where(fuera, -1, i).astype(np.int32)
+    j = np.where(fuera, -1, j).astype(np.int32)
+    return i, j
+
+
+def rectangulo_celda(i, j, bbox=BBOX_CDMX, grid_size=10):
+    lat_min, lng_min, lat_max, lng_max = bbox
+    lat_step = (lat_max - lat_min) / grid_size
+    lng_step = (lng_max - lng_min) / grid_size
+    sw_lat = lat_min + i * lat_step
+    sw_lng = lng_min + j * lng_step
+    return sw_lat, sw_lng, sw_lat + lat_step, sw_lng + lng_step
+
+
+# Una fila por celda con lugares: celda (= i * grid_size + j), i, j, taquerias,
+# rating_promedio y la fracción de lugares en cada nivel de precio
+def agregar_por_celda(df, bbox=BBOX_CDMX, grid_size=10):
+    i, j = indices_celda(df["lat"], df["lng"], bbox, grid_size)
+    dentro = i >= 0
+    precio = df["priceLevel"].fillna(SIN_PRECIO).to_numpy()[dentro]
+
+    tabla = pd.concat([
+        pd.DataFrame({
+            "celda": i[dentro] * grid_size + j[dentro],
+            "rating": df["rating"].to_numpy(dtype=float)[dentro],
+        }),
+        pd.get_dummies(pd.Series(precio), dtype=float),
+    ], axis=1)
+
+    niveles = [c for c in tabla.columns if c not in ("celda", "rating")]
+    agregado = tabla.groupby("celda").agg(
+        taquerias=("rating", "size"),
+        rating_promedio=("rating", "mean"),
+        **{nivel: (nivel, "mean") for nivel in niveles},
+    ).reset_index()
+    agregado.insert(1, "i", agregado["celda"] // grid_size)
+    agregado.insert(2, "j", agregado["celda"] % grid_size)
+    return agregado
+
+
+def geojson_celdas(agregado, bbox=BBOX_CDMX, grid_size=10):
+    features = []
+    # to_json deja tipos nativos de JSON (NaN → null)
+    for fila in json.loads(agregado.round(2).to_json(orient="records")):
+        sw_lat, sw_lng, ne_lat, ne_lng = rectangulo_celda(fila["i"], fila["j"], bbox, grid_size)
+        features.append({
+            "type": "Feature",
+            "id": str(fila["celda"]),
+            "properties": fila,
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [[
+                    [sw_lng, sw_lat], [ne_lng, sw_lat], [ne_lng, ne_lat], [sw_lng, ne_lat], [sw_lng, sw_lat],
+                ]],
+            },
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def capa_coropletas(agregado, bbox=BBOX_CDMX, grid_size=10, columna="taquerias", nombre="Taquerías por celda"):
+    datos = agregado.assign(celda=agregado["celda"].astype(str))
+    coropletas = folium.Choropleth(
+        geo_data=geojson_celdas(agregado, bbox, grid_size),
+        data=datos,
+        columns=["celda", columna],
+        key_on="feature.id",
+        fill_color="YlOrRd",
+        fill_opacity=0.6,
+        line_opacity=0.3,
+        legend_name=nombre,
+        name=nombre,
+    )
+    campos = ["taquerias", "rating_promedio"] + [c for c in agregado.columns if c.startswith("PRICE_LEVEL") or c == SIN_PRECIO]
+    folium.GeoJsonTooltip(fields=campos).add_to(coropletas.geojson)
+    return coropletas
+
+
+# Muestra `lejos` con zoom menor a `zoom` y `cerca` con zoom mayor o igual
+class CapasPorZoom(MacroElement):
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var mapa = {{ this._parent.get_name() }};
+            function actualizar() {
+                if (mapa.getZoom() < {{ this.zoom }}) {
+                    mapa.addLayer({{ this.lejos.get_name() }});
+                    mapa.removeLayer({{ this.cerca.get_name() }});
+                } else {
+                    mapa.addLayer({{ this.cerca.get_name() }});
+                    mapa.removeLayer({{ this.lejos.get_name() }});
+                }
+            }
+            mapa.on('zoomend', actualizar);
+            actualizar();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, lejos, cerca, zoom=14):
+        super().__init__()
+        self._name = "CapasPorZoom"
+        self.lejos = lejos
+        self.cerca = cerca
+        self.zoom = zoom
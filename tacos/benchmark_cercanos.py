@@ -0,0 +1,111 @@
+import argparse
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlparse
+
+import numpy as np
+import pandas as pd
+
+from servicio_cercanos import IndiceCercanos, ServidorCercanos, haversine_m
+
+# Latencia de consultas "¿qué hay cerca?": en proceso (índice vs. recorrer toda la tabla)
+# y por HTTP con varios clientes concurrentes, cada uno con su conexión keep-alive.
+# Uso: python benchmark_cercanos.py --consultas 2000 --clientes 1 8 32
+RADIOS = [500, 1000, 3000]
+
+
+# Puntos de consulta cerca de taquerías reales (desplazados hasta ~1 km)
+def puntos_consulta(indice, n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    k = rng.integers(0, len(indice), n)
+    return indice.lat[k] + rng.normal(0, 0.005, n), indice.lng[k] + rng.normal(0, 0.005, n)
+
+
+def percentiles_ms(tiempos):
+    p50, p99 = np.percentile(np.asarray(tiempos) * 1000, [50, 99])
+    return p50, p99
+
+
+# Lo mismo que consultar() pero calculando la distancia a todos los lugares
+def consulta_fuerza_bruta(indice, lat, lng, radio_m, n=10):
+    distancia = haversine_m(lat, lng, indice.lat, indice.lng)
+    idx = np.flatnonzero(distancia <= radio_m)
+    orden = np.lexsort((distancia[idx], -indice.puntaje[idx]))[:n]
+    return idx[orden], distancia[idx][orden]
+
+
+def medir_en_proceso(funcion, lats, lngs, radio_m):
+    tiempos = []
+    for lat, lng in zip(lats, lngs):
+        inicio = time.perf_counter()
+        funcion(lat, lng, radio_m)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def medir_http(url, lats, lngs, radio_m, clientes):
+    destino = urlparse(url)
+    local = threading.local()
+
+    def consultar(punto):
+        if not hasattr(local, "conexion"):
+            local.conexion = http.client.HTTPConnection(destino.hostname, destino.port)
+        ruta = "/cercanos?" + urlencode({"lat": punto[0], "lng": punto[1], "radio_m": radio_m, "n": 10})
+        inicio = time.perf_counter()
+        local.conexion.request("GET", ruta)
+        respuesta = local.conexion.getresponse()
+        respuesta.read()
+        if respuesta.status != 200:
+            raise RuntimeError(f"Respuesta {respuesta.status} para {ruta}")
+        return time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as pool:
+        tiempos = list(pool.map(consultar, zip(lats, lngs)))
+    return tiempos, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del servicio de taquerías cercanas")
+    parser.add_argument("--entrada", default="tacos_CDMX_sorted.csv")
+    parser.add_argument("--consultas", type=int, default=2000)
+    parser.add_argument("--clientes", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    indice = IndiceCercanos(pd.read_csv(args.entrada))
+    print(f"🧱 Índice de {len(indice)} lugares en {time.perf_counter() - inicio:.2f} s "
+          f"({indice.filas}×{indice.columnas} celdas)")
+    lats, lngs = puntos_consulta(indice, args.consultas)
+
+    # Los dos caminos deben dar el mismo top (se comparan puntajes y distancias para
+    # no depender del orden entre lugares empatados)
+    for lat, lng in zip(lats[:50], lngs[:50]):
+        a, da = indice.consultar(lat, lng, RADIOS[-1])
+        b, db = consulta_fuerza_bruta(indice, lat, lng, RADIOS[-1])
+        assert np.array_equal(indice.puntaje[a], indice.puntaje[b]) and np.allclose(da, db), \
+            "El índice y la fuerza bruta no coinciden"
+
+    print(f"\n⏱️ En proceso, {args.consultas} consultas (ms)")
+    print(f"{'radio (m)':>9} | {'método':>13} | {'p50':>7} | {'p99':>7}")
+    for radio in RADIOS:
+        for nombre, funcion in [("índice", indice.consultar),
+                                ("fuerza bruta", lambda la, ln, r: consulta_fuerza_bruta(indice, la, ln, r))]:
+            p50, p99 = percentiles_ms(medir_en_proceso(funcion, lats, lngs, radio))
+            print(f"{radio:>9} | {nombre:>13} | {p50:>7.3f} | {p99:>7.3f}")
+
+    servidor = ServidorCercanos(("127.0.0.1", 0), indice)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    print(f"\n🌐 HTTP contra {servidor.url}/cercanos, radio {RADIOS[1]} m (ms)")
+    print(f"{'clientes':>8} | {'req/s':>8} | {'p50':>7} | {'p99':>7}")
+    for clientes in args.clientes:
+        tiempos, total = medir_http(servidor.url, lats, lngs, RADIOS[1], clientes)
+        p50, p99 = percentiles_ms(tiempos)
+        print(f"{clientes:>8} | {len(tiempos) / total:>8.0f} | {p50:>7.2f} | {p99:>7.2f}")
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from crawler_places import BBOX_CDMX, CrawlerPlaces, celdas_cuadricula
+from stub_places import ServidorPlaces
+
+# Tasa sostenida del crawler contra el stub local de Places (sin gastar cuota).
+# Uso: python benchmark_crawler.py
+TASA = 10
+GRID_SIZE = 15
+CONCURRENCIAS = [1, 4, 16]
+
+
+async def recorrer_cuadricula(crawler):
+    lugares = 0
+    async for _, _, data in crawler.recorrer("Tacos", celdas_cuadricula(BBOX_CDMX, GRID_SIZE)):
+        if data:
+            lugares += len(data.get("places", []))
+    return lugares
+
+
+if __name__ == "__main__":
+    # El stub rechaza con 429 todo lo que pase de TASA req/s y falla el 2% con 503
+    servidor = ServidorPlaces(tasa=TASA, prob_error=0.02, latencia=0.2).iniciar()
+    celdas = GRID_SIZE * GRID_SIZE
+    print(f"🧪 {celdas} celdas contra {servidor.url}, límite {TASA} req/s, ideal {celdas / TASA:.1f} s")
+    print(f"{'concurrencia':>12} | {'tiempo (s)':>10} | {'req/s':>6} | {'reintentos':>10} | {'429':>4} | {'lugares':>7}")
+
+    for concurrencia in CONCURRENCIAS:
+        servidor.conteos.update({"solicitudes": 0, "429": 0, "5xx": 0})
+        crawler = CrawlerPlaces("stub", url=servidor.url, tasa=TASA, concurrencia=concurrencia, espera_base=0.1)
+        inicio = time.perf_counter()
+        lugares = asyncio.run(recorrer_cuadricula(crawler))
+        t = time.perf_counter() - inicio
+
+        e = crawler.estadisticas
+        print(f"{concurrencia:>12} | {t:>10.1f} | {e['solicitudes'] / t:>6.2f} | {e['reintentos']:>10} "
+              f"| {servidor.conteos['429']:>4} | {lugares:>7}")
+
+    servidor.shutdown()
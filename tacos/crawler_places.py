@@ -0,0 +1,181 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+import aiohttp
+
+# Búsqueda concurrente en Places API (places:searchText) respetando la cuota.
+# Un limitador de tokens reparte las solicitudes a la tasa permitida (10 req/s),
+# una sola sesión HTTP reutiliza las conexiones (keep-alive) y un máximo de
+# solicitudes en vuelo acota la concurrencia. Las respuestas 429/5xx se reintentan
+# con espera exponencial (o la que indique Retry-After).
+URL_PLACES = "https://places.googleapis.com/v1/places:searchText"
+FIELD_MASK = "places.id,places.displayName,places.generativeSummary,places.formattedAddress,places.priceLevel,places.priceRange,places.rating,places.userRatingCount,places.location,places.websiteUri"
+
+# Área de la Ciudad de México: (lat_min, lng_min, lat_max, lng_max)
+BBOX_CDMX = (19.29099, -99.224607, 19.521517, -99.036189)
+
+CODIGOS_REINTENTABLES = {429, 500, 502, 503, 504}
+
+
+# Celdas (i, j) de una cuadrícula de grid_size × grid_size sobre el bbox
+def celdas_cuadricula(bbox, grid_size):
+    lat_min, lng_min, lat_max, lng_max = bbox
+    lat_step = (lat_max - lat_min) / grid_size
+    lng_step = (lng_max - lng_min) / grid_size
+
+    celdas = []
+    for i in range(grid_size):
+        for j in range(grid_size):
+            sw_lat = lat_min + i * lat_step
+            sw_lng = lng_min + j * lng_step
+            celdas.append(((i, j), (sw_lat, sw_lng, sw_lat + lat_step, sw_lng + lng_step)))
+    return celdas
+
+
+def payload_rectangulo(consulta, rectangulo):
+    sw_lat, sw_lng, ne_lat, ne_lng = rectangulo
+    return {
+        "textQuery": consulta,
+        "locationRestriction": {
+            "rectangle": {
+                "low": {"latitude": round(sw_lat, 6), "longitude": round(sw_lng, 6)},
+                "high": {"latitude": round(ne_lat, 6), "longitude": round(ne_lng, 6)},
+            }
+        },
+    }
+
+
+# Cubeta de tokens: se rellena a `tasa` tokens por segundo hasta `capacidad`.
+# Con capacidad=1 las solicitudes salen espaciadas exactamente 1/tasa segundos.
+class LimitadorTokens:
+    def __init__(self, tasa, capacidad=1):
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self.tokens = capacidad
+        self.ultimo = time.monotonic()
+        self._candado = asyncio.Lock()
+
+    async def adquirir(self):
+        async with self._candado:
+            while True:
+                ahora = time.monotonic()
+                self.tokens = min(self.capacidad, self.tokens + (ahora - self.ultimo) * self.tasa)
+                self.ultimo = ahora
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.tasa)
+
+
+class CrawlerPlaces:
+    def __init__(self, api_key, url=URL_PLACES, tasa=10, concurrencia=16, reintentos=5,
+                 field_mask=FIELD_MASK, espera_base=0.5, espera_max=30, timeout=30, diario=None):
+        self.api_key = api_key
+        self.url = url
+        self.limitador = LimitadorTokens(tasa)
+        self.concurrencia = concurrencia
+        self.reintentos = reintentos
+        self.field_mask = field_mask
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.timeout = timeout
+        # DiarioRespuestas opcional: respuestas ya guardadas no gastan solicitud
+        self.diario = diario
+        self.estadisticas = {"solicitudes": 0, "reintentos": 0, "errores": 0, "del_diario": 0}
+
+    def _encabezados(self):
+        return {
+            "Content-Type": "application/json",
+            "X-Goog-Api-Key": self.api_key,
+            "X-Goog-FieldMask": self.field_mask,
+        }
+
+    def _espera(self, intento, respuesta=None):
+        if respuesta is not None and "Retry-After" in respuesta.headers:
+            try:
+                return float(respuesta.headers["Retry-After"])
+            except ValueError:
+                pass
+        return min(self.espera_max, self.espera_base * 2 ** intento) * random.uniform(0.5, 1)
+
+    def _contar(self, campo, estadisticas):
+        self.estadisticas[campo] += 1
+        if estadisticas is not None:
+            estadisticas[campo] += 1
+
+    # Una solicitud con reintentos; regresa el JSON o None si falló definitivamente.
+    # `estadisticas` (opcional) recibe los mismos conteos que self.estadisticas,
+    # para llevar la cuenta por trabajo cuando se mezclan varios.
+    async def buscar(self, sesion, payload, etiqueta="", estadisticas=None):
+        if self.diario is not None:
+            guardada = self.diario.obtener(payload, self.field_mask)
+            if guardada is not None:
+                self._contar("del_diario", estadisticas)
+                return guardada
+
+        for intento in range(self.reintentos + 1):
+            await self.limitador.adquirir()
+            self._contar("solicitudes", estadisticas)
+            try:
+                async with sesion.post(self.url, json=payload) as respuesta:
+                    if respuesta.status == 200:
+                        datos = await respuesta.json()
+                        if self.diario is not None:
+                            self.diario.guardar(payload, self.field_mask, datos)
+                        return datos
+                    texto = await respuesta.text()
+                    if respuesta.status not in CODIGOS_REINTENTABLES or intento == self.reintentos:
+                        print(f"❌ Error in cell {etiqueta}: {respuesta.status} - {texto}")
+                        self._contar("errores", estadisticas)
+                        return None
+                    espera = self._espera(intento, respuesta)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if intento == self.reintentos:
+                    print(f"❌ Error in cell {etiqueta}: {error!r}")
+                    self._contar("errores", estadisticas)
+                    return None
+                espera = self._espera(intento)
+            self._contar("reintentos", estadisticas)
+            await asyncio.sleep(espera)
+
+    def abrir_sesion(self):
+        conector = aiohttp.TCPConnector(limit=self.concurrencia, keepalive_timeout=60)
+        return aiohttp.ClientSession(
+            connector=conector,
+            headers=self._encabezados(),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    # Recorre (clave, rectangulo) para una consulta con a lo más `concurrencia`
+    # solicitudes en vuelo; produce (clave, rectangulo, datos) en orden de llegada.
+    # Si se da `expandir(clave, rectangulo, datos)`, las celdas que regrese se
+    # agregan al recorrido antes que las que faltan (subdivisión adaptativa).
+    async def recorrer(self, consulta, celdas, expandir=None):
+        celdas = iter(celdas)
+        nuevas = deque()
+        async with self.abrir_sesion() as sesion:
+            en_vuelo = {}
+
+            def lanzar():
+                while len(en_vuelo) < self.concurrencia:
+                    siguiente = nuevas.popleft() if nuevas else next(celdas, None)
+                    if siguiente is None:
+                        return
+                    clave, rectangulo = siguiente
+                    tarea = asyncio.ensure_future(
+                        self.buscar(sesion, payload_rectangulo(consulta, rectangulo), etiqueta=clave)
+                    )
+                    en_vuelo[tarea] = (clave, rectangulo)
+
+            lanzar()
+            while en_vuelo:
+                listas, _ = await asyncio.wait(en_vuelo, return_when=asyncio.FIRST_COMPLETED)
+                for tarea in listas:
+                    clave, rectangulo = en_vuelo.pop(tarea)
+                    datos = tarea.result()
+                    if expandir is not None and datos is not None:
+                        nuevas.extend(expandir(clave, rectangulo, datos))
+                    yield clave, rectangulo, datos
+                lanzar()
@@ -0,0 +1,37 @@
+# Subdivisión adaptativa (quadtree) de la cuadrícula de búsqueda.
+# Places regresa a lo más 20 lugares por solicitud: si una celda llega saturada
+# (20 resultados o nextPageToken) pueden faltar lugares, así que se parte en cuatro
+# y se vuelve a consultar cada cuarto. Las celdas vacías o con pocos lugares no se
+# dividen, de modo que las afueras cuestan una sola solicitud.
+MAX_RESULTADOS = 20
+# ~110 m de lado: por debajo de esto ya no se divide (evita recursión sin fin en
+# puntos con más de 20 lugares casi en la misma coordenada)
+TAMANO_MINIMO = 0.001
+
+
+def saturada(datos, max_resultados=MAX_RESULTADOS):
+    return bool(datos) and (len(datos.get("places", [])) >= max_resultados or "nextPageToken" in datos)
+
+
+# Los cuatro cuadrantes (SW, SE, NW, NE) de un rectángulo (sw_lat, sw_lng, ne_lat, ne_lng)
+def dividir_rectangulo(rectangulo):
+    sw_lat, sw_lng, ne_lat, ne_lng = rectangulo
+    lat_mid = (sw_lat + ne_lat) / 2
+    lng_mid = (sw_lng + ne_lng) / 2
+    return [
+        (sw_lat, sw_lng, lat_mid, lng_mid),
+        (sw_lat, lng_mid, lat_mid, ne_lng),
+        (lat_mid, sw_lng, ne_lat, lng_mid),
+        (lat_mid, lng_mid, ne_lat, ne_lng),
+    ]
+
+
+# Función `expandir` para CrawlerPlaces.recorrer: la clave de cada hijo es la del
+# padre más el número de cuadrante, p. ej. (3, 7) → (3, 7, 2) → (3, 7, 2, 0)
+def expansion_adaptativa(max_resultados=MAX_RESULTADOS, tamano_minimo=TAMANO_MINIMO):
+    def expandir(clave, rectangulo, datos):
+        sw_lat, sw_lng, ne_lat, ne_lng = rectangulo
+        if not saturada(datos, max_resultados) or min(ne_lat - sw_lat, ne_lng - sw_lng) < 2 * tamano_minimo:
+            return []
+        return [(clave + (k,), hijo) for k, hijo in enumerate(dividir_rectangulo(rectangulo))]
+    return expandir
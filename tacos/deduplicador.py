@@ -0,0 +1,40 @@
+# Deduplicación en línea de lugares que regresan varias celdas (vecinas o padre e
+# hijas en la cuadrícula adaptativa). Se decide al llegar cada lugar, con un
+# conjunto de claves ya vistas, así que el CSV sale sin duplicados y sin una
+# segunda pasada. La clave es el id de Places; si no viene, nombre normalizado
+# más lat/lng redondeadas (4 decimales ≈ 11 m).
+DECIMALES = 4
+
+
+def clave_lugar(place, decimales=DECIMALES):
+    if place.get("id"):
+        return place["id"]
+    nombre = (place.get("displayName") or {}).get("text") or ""
+    ubicacion = place.get("location") or {}
+    return (
+        " ".join(nombre.casefold().split()),
+        round(ubicacion.get("latitude") or 0.0, decimales),
+        round(ubicacion.get("longitude") or 0.0, decimales),
+    )
+
+
+class DeduplicadorLugares:
+    def __init__(self, decimales=DECIMALES):
+        self.decimales = decimales
+        self.vistos = set()
+        self.duplicados = 0
+
+    def es_nuevo(self, place):
+        clave = clave_lugar(place, self.decimales)
+        if clave in self.vistos:
+            self.duplicados += 1
+            return False
+        self.vistos.add(clave)
+        return True
+
+    # Solo los lugares que no se habían visto, en el mismo orden
+    def filtrar(self, places):
+        return [place for place in places if self.es_nuevo(place)]
+
+    def __len__(self):
+        return len(self.vistos)
@@ -0,0 +1,125 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+from folium.plugins import HeatMap
+
+from agregacion_cuadricula import BBOX_CDMX
+
+# Superficie de densidad de taquerías (KDE gaussiano) sobre el bbox de CDMX.
+# Los lugares se acumulan en una malla fina con np.histogram2d (opcionalmente
+# ponderados por userRatingCount) y la malla se suaviza con un kernel gaussiano
+# convolucionado por FFT, así que el costo depende del tamaño de la malla y no del
+# producto lugares × celdas. El resultado se guarda como arreglo (.npz) y se puede
+# agregar a los mapas de folium como capa de calor; puntos_calientes() da los máximos.
+METROS_POR_GRADO = 111_320.0
+PESOS = ("ninguno", "resenas", "log_resenas")
+
+
+def pesos_lugares(df, peso="ninguno"):
+    if peso == "ninguno":
+        return None
+    conteo = df["userRatingCount"].fillna(0).to_numpy(dtype=float)
+    if peso == "resenas":
+        return conteo
+    if peso == "log_resenas":
+        return np.log1p(conteo)
+    raise ValueError(f"Peso desconocido: {peso} (opciones: {', '.join(PESOS)})")
+
+
+# Convolución "same" de la malla con un gaussiano separable de desviación `sigma` celdas
+def suavizar_fft(malla, sigma):
+    radio = max(1, int(np.ceil(4 * sigma)))
+    ejes = np.arange(-radio, radio + 1)
+    g = np.exp(-0.5 * (ejes / sigma) ** 2)
+    kernel = np.outer(g, g)
+    kernel /= kernel.sum()
+
+    forma = (malla.shape[0] + 2 * radio, malla.shape[1] + 2 * radio)
+    espectro = np.fft.rfft2(malla, forma) * np.fft.rfft2(kernel, forma)
+    suave = np.fft.irfft2(espectro, forma)[radio:radio + malla.shape[0], radio:radio + malla.shape[1]]
+    return np.maximum(suave, 0)  # quita el ruido numérico negativo de la FFT
+
+
+class SuperficieDensidad:
+    def __init__(self, lat, lng, pesos=None, bbox=BBOX_CDMX, tam_celda_m=100, ancho_banda_m=500):
+        lat_min, lng_min, lat_max, lng_max = bbox
+        self.bbox = bbox
+        self.tam_celda_m = tam_celda_m
+        self.ancho_banda_m = ancho_banda_m
+
+        # Celdas de ~tam_celda_m por lado (en longitud se corrige por la latitud)
+        paso_lat = tam_celda_m / METROS_POR_GRADO
+        paso_lng = tam_celda_m / (METROS_POR_GRADO * np.cos(np.radians((lat_min + lat_max) / 2)))
+        bordes_lat = np.arange(lat_min, lat_max + paso_lat, paso_lat)
+        bordes_lng = np.arange(lng_min, lng_max + paso_lng, paso_lng)
+
+        malla, _, _ = np.histogram2d(
+            np.asarray(lat, dtype=float), np.asarray(lng, dtype=float),
+            bins=[bordes_lat, bordes_lng], weights=pesos,
+        )
+        area_km2 = (tam_celda_m / 1000) ** 2
+        # Densidad en lugares (o peso) por km²; filas = latitud, columnas = longitud
+        self.densidad = suavizar_fft(malla, ancho_banda_m / tam_celda_m) / area_km2
+        self.lat_centros = (bordes_lat[:-1] + bordes_lat[1:]) / 2
+        self.lng_centros = (bordes_lng[:-1] + bordes_lng[1:]) / 2
+
+    @classmethod
+    def desde_df(cls, df, peso="ninguno", **opciones):
+        df = df[df["lat"].notna() & df["lng"].notna()]
+        return cls(df["lat"], df["lng"], pesos_lugares(df, peso), **opciones)
+
+    # Los n máximos locales (vecindad 3×3) más altos: (lat, lng, densidad)
+    def puntos_calientes(self, n=10):
+        d = self.densidad
+        relleno = np.pad(d, 1, constant_values=-np.inf)
+        vecinos = [relleno[1 + di:1 + di + d.shape[0], 1 + dj:1 + dj + d.shape[1]]
+                   for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+        maximos = (d >= np.max(vecinos, axis=0)) & (d > 0)
+        filas, columnas = np.nonzero(maximos)
+        orden = np.argsort(-d[filas, columnas])[:n]
+        return pd.DataFrame({
+            "lat": self.lat_centros[filas[orden]],
+            "lng": self.lng_centros[columnas[orden]],
+            "densidad_km2": d[filas[orden], columnas[orden]],
+        })
+
+    def guardar(self, ruta):
+        np.savez_compressed(
+            ruta, densidad=self.densidad.astype(np.float32), lat=self.lat_centros, lng=self.lng_centros,
+            bbox=np.asarray(self.bbox), tam_celda_m=self.tam_celda_m, ancho_banda_m=self.ancho_banda_m,
+        )
+
+    # Capa de calor para folium con las celdas que superan `fraccion_minima` del máximo
+    def capa_calor(self, nombre="Densidad de taquerías", fraccion_minima=0.02, radius=12, blur=15):
+        maximo = self.densidad.max()
+        filas, columnas = np.nonzero(self.densidad > fraccion_minima * maximo)
+        datos = np.column_stack([
+            self.lat_centros[filas],
+            self.lng_centros[columnas],
+            self.densidad[filas, columnas] / maximo,
+        ]).tolist()
+        return HeatMap(datos, name=nombre, radius=radius, blur=blur, max_zoom=15)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Densidad y puntos calientes de taquerías")
+    parser.add_argument("--entrada", default="tacos_CDMX.csv")
+    parser.add_argument("--salida", default="densidad_CDMX.npz")
+    parser.add_argument("--ancho-banda", type=float, default=500, help="Desviación del kernel en metros")
+    parser.add_argument("--tam-celda", type=float, default=100, help="Lado de la celda de la malla en metros")
+    parser.add_argument("--peso", choices=PESOS, default="ninguno")
+    parser.add_argument("-n", type=int, default=10, help="Puntos calientes a mostrar")
+    args = parser.parse_args()
+
+    superficie = SuperficieDensidad.desde_df(
+        pd.read_csv(args.entrada), peso=args.peso, tam_celda_m=args.tam_celda, ancho_banda_m=args.ancho_banda
+    )
+    superficie.guardar(args.salida)
+    print(f"✅ Malla de {superficie.densidad.shape[0]}×{superficie.densidad.shape[1]} guardada en {args.salida}")
+    print(f"\n🔥 Puntos calientes (ancho de banda {args.ancho_banda:g} m, peso: {args.peso}):")
+    print(superficie.puntos_calientes(args.n).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
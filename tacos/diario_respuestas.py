@@ -0,0 +1,71 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+# Diario en disco de respuestas de Places (SQLite). Cada respuesta exitosa se guarda
+# en cuanto llega, con clave = hash de (payload, field mask); el payload ya incluye
+# la consulta, el rectángulo y el pageToken. Así:
+#   - si el crawl se cae, al reiniciarlo las celdas ya respondidas no se vuelven a pedir;
+#   - si se repite dentro del TTL, todo sale del diario sin tocar la API.
+# Las solicitudes fallidas no se guardan, así que se reintentan en la siguiente corrida.
+TTL_HORAS = 24 * 7
+
+
+def clave_respuesta(payload, field_mask):
+    texto = json.dumps(payload, sort_keys=True, separators=(",", ":")) + "|" + field_mask
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+class DiarioRespuestas:
+    def __init__(self, ruta="respuestas_places.sqlite", ttl_horas=TTL_HORAS):
+        self.ruta = ruta
+        self.ttl = ttl_horas * 3600
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute(
+            "CREATE TABLE IF NOT EXISTS respuestas ("
+            " clave TEXT PRIMARY KEY, consulta TEXT, payload TEXT, field_mask TEXT,"
+            " respuesta TEXT, guardado REAL)"
+        )
+        self.conexion.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def cerrar(self):
+        self.conexion.close()
+
+    # Respuesta guardada si existe y no ha vencido; si no, None
+    def obtener(self, payload, field_mask):
+        fila = self.conexion.execute(
+            "SELECT respuesta, guardado FROM respuestas WHERE clave = ?",
+            (clave_respuesta(payload, field_mask),),
+        ).fetchone()
+        if fila is None or time.time() - fila[1] > self.ttl:
+            return None
+        return json.loads(fila[0])
+
+    def guardar(self, payload, field_mask, respuesta):
+        self.conexion.execute(
+            "INSERT OR REPLACE INTO respuestas VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                clave_respuesta(payload, field_mask),
+                payload.get("textQuery"),
+                json.dumps(payload, sort_keys=True),
+                field_mask,
+                json.dumps(respuesta),
+                time.time(),
+            ),
+        )
+        # Un commit por respuesta: lo ya recibido sobrevive a una caída
+        self.conexion.commit()
+
+    # Borra las respuestas vencidas; regresa cuántas se borraron
+    def purgar(self):
+        cursor = self.conexion.execute("DELETE FROM respuestas WHERE guardado < ?", (time.time() - self.ttl,))
+        self.conexion.commit()
+        return cursor.rowcount
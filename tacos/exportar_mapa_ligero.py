@@ -0,0 +1,220 @@
+import argparse
+import base64
+import json
+import os
+from string import Template
+
+import numpy as np
+import pandas as pd
+
+from agregacion_cuadricula import BBOX_CDMX
+from mapas_comunes import COLORES_PRECIO
+
+# Exportación ligera de los mapas de taquerías: en vez de un objeto JS y un popup
+# por lugar (lo que genera folium), el HTML lleva los datos una sola vez en forma
+# compacta y un solo ciclo de dibujo:
+#   - lat/lng como Float32Array intercalado en base64 (8 bytes por lugar);
+#   - rating ×10 y nivel de precio como Uint8Array en base64;
+#   - nombres y direcciones como dos arreglos JSON.
+# Los puntos se pintan en canvas por mosaico (L.GridLayer) y el popup se arma al
+# hacer clic buscando el punto más cercano, así que no hay marcadores por lugar.
+# Los lugares van ordenados por cubeta de una cuadrícula (con el inicio de cada cubeta
+# en un Uint32Array), así que cada mosaico y cada clic solo recorren las cubetas que
+# tocan, no los n puntos.
+# Uso (equivalentes ligeros de tacos_CDMX_map.html y tacos_CDMX_grid_map.html):
+#   python exportar_mapa_ligero.py --salida tacos_CDMX_map_ligero.html --comparar tacos_CDMX_map.html
+#   python exportar_mapa_ligero.py --cuadricula 10 --salida tacos_CDMX_grid_map_ligero.html --comparar tacos_CDMX_grid_map.html
+HEX_COLORES = {"green": "#2e7d32", "blue": "#1565c0", "orange": "#ef6c00", "red": "#c62828", "gray": "#757575"}
+PUNTOS_POR_CUBETA = 16
+MAX_CUBETAS_LADO = 512
+
+PLANTILLA = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>$titulo</title>
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css">
+<script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+<style>html, body, #mapa { height: 100%; margin: 0; }</style>
+</head>
+<body>
+<div id="mapa"></div>
+<script>
+function decodificar(b64, Tipo) {
+    var bin = atob(b64), bytes = new Uint8Array(bin.length);
+    for (var k = 0; k < bin.length; k++) bytes[k] = bin.charCodeAt(k);
+    return new Tipo(bytes.buffer);
+}
+var coords = decodificar("$coords", Float32Array);
+var rating = decodificar("$rating", Uint8Array);
+var precio = decodificar("$precio", Uint8Array);
+var nombres = $nombres;
+var direcciones = $direcciones;
+var niveles = $niveles;
+var colores = $colores;
+var cubetas = $cubetas;
+var inicios = decodificar("$inicios", Uint32Array);
+
+// Llama a visitar(k) con los puntos de las cubetas que cruzan el rectángulo; en cada
+// fila de la cuadrícula las cubetas son contiguas, así que es una rebanada por fila
+function puntosEn(latS, lngO, latN, lngE, visitar) {
+    var f = cubetas.filas, c = cubetas.columnas;
+    var i0 = Math.max(0, Math.floor((latS - cubetas.lat_min) / cubetas.paso_lat));
+    var i1 = Math.min(f - 1, Math.floor((latN - cubetas.lat_min) / cubetas.paso_lat));
+    var j0 = Math.max(0, Math.floor((lngO - cubetas.lng_min) / cubetas.paso_lng));
+    var j1 = Math.min(c - 1, Math.floor((lngE - cubetas.lng_min) / cubetas.paso_lng));
+    for (var i = i0; i <= i1 && j0 <= j1; i++) {
+        for (var k = inicios[i * c + j0], fin = inicios[i * c + j1 + 1]; k < fin; k++) visitar(k);
+    }
+}
+
+var mapa = L.map("mapa", {preferCanvas: true}).setView([$centro_lat, $centro_lng], 12);
+L.tileLayer("https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png", {
+    maxZoom: 19, attribution: "&copy; OpenStreetMap"
+}).addTo(mapa);
+
+// Un solo ciclo por mosaico: se pintan los puntos que caen dentro de él
+var Puntos = L.GridLayer.extend({
+    createTile: function (c) {
+        var tile = document.createElement("canvas"), size = this.getTileSize();
+        tile.width = size.x; tile.height = size.y;
+        var ctx = tile.getContext("2d");
+        var nw = mapa.unproject([c.x * size.x, c.y * size.y], c.z);
+        var se = mapa.unproject([(c.x + 1) * size.x, (c.y + 1) * size.y], c.z);
+        var margen = (nw.lat - se.lat) * 0.05;
+        var radio = c.z < 13 ? 2 : 4;
+        puntosEn(se.lat - margen, nw.lng - margen, nw.lat + margen, se.lng + margen, function (k) {
+            var lat = coords[2 * k], lng = coords[2 * k + 1];
+            if (lat > nw.lat + margen || lat < se.lat - margen || lng < nw.lng - margen || lng > se.lng + margen) return;
+            var p = mapa.project([lat, lng], c.z);
+            ctx.beginPath();
+            ctx.arc(p.x - c.x * size.x, p.y - c.y * size.y, radio, 0, 2 * Math.PI);
+            ctx.fillStyle = colores[precio[k]];
+            ctx.fill();
+        });
+        return tile;
+    }
+});
+new Puntos().addTo(mapa);
+
+// Popup del punto más cercano al clic (a lo más 8 px)
+mapa.on("click", function (e) {
+    var clic = mapa.latLngToLayerPoint(e.latlng), mejor = -1, mejorDist = 64;
+    var no = mapa.layerPointToLatLng([clic.x - 8, clic.y - 8]), se = mapa.layerPointToLatLng([clic.x + 8, clic.y + 8]);
+    puntosEn(se.lat, no.lng, no.lat, se.lng, function (k) {
+        var p = mapa.latLngToLayerPoint([coords[2 * k], coords[2 * k + 1]]);
+        var d = (p.x - clic.x) * (p.x - clic.x) + (p.y - clic.y) * (p.y - clic.y);
+        if (d < mejorDist) { mejorDist = d; mejor = k; }
+    });
+    if (mejor < 0) return;
+    var div = document.createElement("div");
+    var b = document.createElement("b");
+    b.textContent = nombres[mejor];
+    div.appendChild(b);
+    [direcciones[mejor],
+     "Rating: " + (rating[mejor] ? (rating[mejor] / 10).toFixed(1) : "N/A"),
+     "Price Level: " + niveles[precio[mejor]]].forEach(function (texto) {
+        div.appendChild(document.createElement("br"));
+        div.appendChild(document.createTextNode(texto));
+    });
+    L.popup({maxWidth: 300}).setLatLng([coords[2 * mejor], coords[2 * mejor + 1]]).setContent(div).openOn(mapa);
+});
+
+var cuadricula = $cuadricula;
+if (cuadricula) {
+    var b = cuadricula.bbox, g = cuadricula.grid_size, lineas = [];
+    for (var k = 0; k <= g; k++) {
+        var lat = b[0] + k * (b[2] - b[0]) / g, lng = b[1] + k * (b[3] - b[1]) / g;
+        lineas.push([[lat, b[1]], [lat, b[3]]], [[b[0], lng], [b[2], lng]]);
+    }
+    L.polyline(lineas, {color: "black", weight: 1}).addTo(mapa);
+}
+</script>
+</body>
+</html>
+""")
+
+
+def _base64(arreglo):
+    return base64.b64encode(np.ascontiguousarray(arreglo).tobytes()).decode("ascii")
+
+
+# JSON para meter dentro de <script> sin que un "</" cierre la etiqueta
+def _json_script(valor):
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+
+# Orden de los lugares por cubeta (fila-mayor) e inicio de cada cubeta. Se calcula sobre
+# las coordenadas ya en float32, que son las que ve el navegador, con la misma
+# aritmética que puntosEn(), para que cada punto quede en la cubeta donde se le busca.
+def cubetas_puntos(lat, lng):
+    lat = np.asarray(lat, dtype="<f4").astype(float)
+    lng = np.asarray(lng, dtype="<f4").astype(float)
+    lado = int(np.clip(np.ceil(np.sqrt(len(lat) / PUNTOS_POR_CUBETA)), 1, MAX_CUBETAS_LADO))
+    lat_min, lng_min = float(lat.min()), float(lng.min())
+    paso_lat = max((float(lat.max()) - lat_min) / lado, 1e-9)
+    paso_lng = max((float(lng.max()) - lng_min) / lado, 1e-9)
+
+    i = np.clip(np.floor((lat - lat_min) / paso_lat), 0, lado - 1).astype(np.int64)
+    j = np.clip(np.floor((lng - lng_min) / paso_lng), 0, lado - 1).astype(np.int64)
+    celda = i * lado + j
+    orden = np.argsort(celda, kind="stable")
+    inicios = np.concatenate([[0], np.cumsum(np.bincount(celda, minlength=lado * lado))]).astype("<u4")
+    cubetas = {"lat_min": lat_min, "lng_min": lng_min, "paso_lat": paso_lat, "paso_lng": paso_lng,
+               "filas": lado, "columnas": lado}
+    return orden, inicios, cubetas
+
+
+def html_ligero(df, titulo="Tacos CDMX", cuadricula=None):
+    df = df[df["lat"].notna() & df["lng"].notna()]
+    orden, inicios, cubetas = cubetas_puntos(df["lat"], df["lng"])
+    df = df.iloc[orden]
+
+    coords = np.column_stack([df["lat"].to_numpy(), df["lng"].to_numpy()]).astype("<f4")
+    rating = np.round(df["rating"].fillna(0).to_numpy() * 10).clip(0, 255).astype(np.uint8)
+
+    # Código de precio: 0 = sin precio, luego los niveles en el orden en que aparecen
+    niveles = ["N/A"] + list(pd.unique(df["priceLevel"].dropna()))
+    codigos = pd.Categorical(df["priceLevel"], categories=niveles[1:]).codes + 1
+    colores = [HEX_COLORES["gray"]] + [HEX_COLORES[COLORES_PRECIO.get(nivel, "red")] for nivel in niveles[1:]]
+
+    return PLANTILLA.substitute(
+        titulo=titulo,
+        coords=_base64(coords),
+        rating=_base64(rating),
+        precio=_base64(codigos.astype(np.uint8)),
+        nombres=_json_script(df["name"].fillna("").astype(str).tolist()),
+        direcciones=_json_script(df["address"].fillna("").astype(str).tolist()),
+        niveles=_json_script([str(nivel) for nivel in niveles]),
+        colores=_json_script(colores),
+        cubetas=_json_script(cubetas),
+        inicios=_base64(inicios),
+        centro_lat=float(df["lat"].mean()),
+        centro_lng=float(df["lng"].mean()),
+        cuadricula=_json_script(cuadricula),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mapa HTML ligero de taquerías")
+    parser.add_argument("--entrada", default="tacos_CDMX.csv")
+    parser.add_argument("--salida", default="tacos_CDMX_map_ligero.html")
+    parser.add_argument("--cuadricula", type=int, default=None, help="Dibuja una cuadrícula de N×N sobre CDMX")
+    parser.add_argument("--comparar", default=None, help="HTML de folium para comparar tamaños")
+    args = parser.parse_args()
+
+    cuadricula = {"bbox": BBOX_CDMX, "grid_size": args.cuadricula} if args.cuadricula else None
+    df = pd.read_csv(args.entrada)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        f.write(html_ligero(df, cuadricula=cuadricula))
+
+    tam = os.path.getsize(args.salida)
+    print(f"✅ {args.salida}: {len(df)} lugares, {tam / 1024:.0f} KB")
+    if args.comparar and os.path.exists(args.comparar):
+        original = os.path.getsize(args.comparar)
+        print(f"📉 {args.comparar}: {original / 1024:.0f} KB ({original / tam:.1f}x más grande)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,33 @@
+import argparse
 import pandas as pd
-import folium
+from densidad_lugares import PESOS, SuperficieDensidad
+from mapas_comunes import agregar_cluster, agregar_marcadores, artefactos_mapa, mapa_base
 
-# Leer los datos
-df = pd.read_csv("tacos_CDMX.csv")
+parser = argparse.ArgumentParser(description="Mapa de taquerías")
+parser.add_argument("--marcadores", action="store_true",
+                    help="Un folium.Marker por taquería en lugar de marcadores agrupados")
+parser.add_argument("--calor", type=float, default=None, metavar="METROS",
+                    help="Agrega una capa de calor (KDE) con este ancho de banda")
+parser.add_argument("--peso-calor", choices=PESOS, default="ninguno",
+                    help="Ponderación de la capa de calor por número de reseñas")
+args = parser.parse_args()
+
+# Leer los datos (popups ya armados, de la caché si el CSV no ha cambiado)
+df, popups, _ = artefactos_mapa("tacos_CDMX.csv")
 
 # Crear mapa centrado en el promedio de lat/lng
-center_lat = df["lat"].mean()
-center_lng = df["lng"].mean()
-mapa = folium.Map(location=[center_lat, center_lng], zoom_start=12)
+mapa = mapa_base(df)
+
+# Añadir los tacos como marcadores (agrupados del lado del navegador por omisión)
+colores = pd.Series("red", index=df.index)
+if args.marcadores:
+    agregar_marcadores(mapa, df, colores, popups)
+else:
+    agregar_cluster(mapa, df, colores, popups)
 
-# Añadir cada taco como marcador
-for _, row in df.iterrows():
-    popup_text = f"""
-    <b>{row['name']}</b><br>
-    {row['address']}<br>
-    Rating: {row.get('rating', 'N/A')}<br>
-    Price Level: {row.get('priceLevel', 'N/A')}<br>
-    """
-    folium.Marker(
-        location=[row["lat"], row["lng"]],
-        popup=folium.Popup(popup_text, max_width=300),
-        icon=folium.Icon(color="red", icon="cutlery", prefix="fa")
-    ).add_to(mapa)
+# Capa de calor con la densidad de taquerías (malla suavizada por FFT)
+if args.calor:
+    SuperficieDensidad.desde_df(df, peso=args.peso_calor, ancho_banda_m=args.calor).capa_calor().add_to(mapa)
 
 # Guardar el mapa
 mapa.save("tacos_CDMX_map.html")
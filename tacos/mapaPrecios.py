@@ -1,41 +1,32 @@
-import pandas as pd
+import argparse
 import folium
+from agregacion_cuadricula import CapasPorZoom, agregar_por_celda, capa_coropletas
+from densidad_lugares import PESOS, SuperficieDensidad
+from mapas_comunes import agregar_cluster, agregar_marcadores, artefactos_mapa, mapa_base
 
-# Leer los datos
-df = pd.read_csv("tacos_CDMX.csv")
+parser = argparse.ArgumentParser(description="Mapa de taquerías por nivel de precio")
+parser.add_argument("--marcadores", action="store_true",
+                    help="Un folium.Marker por taquería en lugar de marcadores agrupados")
+parser.add_argument("--zoom-marcadores", type=int, default=14,
+                    help="A partir de este zoom se ven los marcadores; antes, las coropletas por celda")
+parser.add_argument("--calor", type=float, default=None, metavar="METROS",
+                    help="Agrega una capa de calor (KDE) con este ancho de banda")
+parser.add_argument("--peso-calor", choices=PESOS, default="ninguno",
+                    help="Ponderación de la capa de calor por número de reseñas")
+args = parser.parse_args()
 
-# Crear mapa centrado en el promedio
-center_lat = df["lat"].mean()
-center_lng = df["lng"].mean()
-mapa = folium.Map(location=[center_lat, center_lng], zoom_start=12)
+# Leer los datos; popups y color según priceLevel (verde, azul, naranja; gris sin
+# precio) se calculan una sola vez por versión del CSV
+df, popups, colores = artefactos_mapa("tacos_CDMX.csv")
 
-# Función para asignar color según priceLevel
-def get_color(price_level):
-    if pd.isna(price_level):
-        return "gray"
-    elif price_level == "PRICE_LEVEL_INEXPENSIVE":
-        return "green"
-    elif price_level == "PRICE_LEVEL_MODERATE":
-        return "blue"
-    elif price_level == "PRICE_LEVEL_EXPENSIVE":
-        return "orange"
-    else:
-        return "red"
+# Crear mapa centrado en el promedio
+mapa = mapa_base(df)
 
 # Añadir marcadores de lugares
-for _, row in df.iterrows():
-    color = get_color(row.get("priceLevel"))
-    popup_text = f"""
-    <b>{row['name']}</b><br>
-    {row['address']}<br>
-    Rating: {row.get('rating', 'N/A')}<br>
-    Price Level: {row.get('priceLevel', 'N/A')}<br>
-    """
-    folium.Marker(
-        location=[row["lat"], row["lng"]],
-        popup=folium.Popup(popup_text, max_width=300),
-        icon=folium.Icon(color=color, icon="cutlery", prefix="fa")
-    ).add_to(mapa)
+if args.marcadores:
+    marcadores = agregar_marcadores(mapa, df, colores, popups)
+else:
+    marcadores = agregar_cluster(mapa, df, colores, popups)
 
 # Crear la cuadrícula 10x10 con etiquetas de coordenadas
 lat_min, lng_min = 19.29099, -99.224607  # SW
@@ -65,6 +56,18 @@ for i in range(grid_size):
             icon=folium.DivIcon(html=f"""<div style="font-size:8pt">{label}</div>""")
         ).add_to(mapa)
 
+# Agregar los lugares en las celdas de la misma cuadrícula (conteo, rating promedio y
+# mezcla de precios por celda) y dibujarlos como coropletas cuando el mapa está alejado
+bbox = (lat_min, lng_min, lat_max, lng_max)
+agregado = agregar_por_celda(df, bbox, grid_size)
+agregado.to_csv("tacos_CDMX_celdas.csv", index=False)
+coropletas = capa_coropletas(agregado, bbox, grid_size).add_to(mapa)
+CapasPorZoom(lejos=coropletas, cerca=marcadores, zoom=args.zoom_marcadores).add_to(mapa)
+
+# Capa de calor con la densidad de taquerías (malla suavizada por FFT)
+if args.calor:
+    SuperficieDensidad.desde_df(df, peso=args.peso_calor, ancho_banda_m=args.calor).capa_calor().add_to(mapa)
+
 # Guardar mapa
 map_file_path = "tacos_CDMX_grid_map.html"
 mapa.save(map_file_path)
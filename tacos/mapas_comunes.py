@@ -0,0 +1,123 @@
+import hashlib
+import os
+import pickle
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import FastMarkerCluster
+
+# Piezas compartidas por los mapas de taquerías (mapa.py, mapaPrecios.py).
+# En lugar de un folium.Marker por fila (un objeto JS y un popup por taquería en el
+# HTML), los puntos se pasan como un solo arreglo [lat, lng, popup, color] armado
+# desde las columnas y el navegador crea los marcadores agrupados (FastMarkerCluster).
+# Así el HTML pesa poco y un mapa de 100k puntos se genera y se abre rápido.
+COLORES_PRECIO = {
+    "PRICE_LEVEL_INEXPENSIVE": "green",
+    "PRICE_LEVEL_MODERATE": "blue",
+    "PRICE_LEVEL_EXPENSIVE": "orange",
+}
+
+# Los popups y colores de un CSV se calculan una vez y se guardan en .cache_mapas/
+# con el hash del contenido del CSV como clave (ver artefactos_mapa); si el CSV no
+# cambia, los siguientes mapas (y el notebook) los leen en lugar de recalcularlos.
+DIRECTORIO_CACHE = ".cache_mapas"
+# Cambiar al modificar popups_html o colores_precio para invalidar lo guardado
+VERSION_ARTEFACTOS = 1
+
+# Las funciones agregar_* regresan la capa creada (para mostrarla u ocultarla según el zoom)
+
+# Crea cada marcador del lado del cliente a partir de una fila [lat, lng, popup, color]
+CALLBACK_MARCADOR = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'cutlery', prefix: 'fa', markerColor: row[3]});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2], {maxWidth: 300});
+    return marker;
+};
+"""
+
+
+def mapa_base(df, zoom_start=12):
+    return folium.Map(location=[df["lat"].mean(), df["lng"].mean()], zoom_start=zoom_start)
+
+
+def _escapar(serie):
+    return (
+        serie.astype(str)
+        .str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+    )
+
+
+# Popup HTML de todas las filas con operaciones de columna (sin iterrows)
+def popups_html(df):
+    rating = df["rating"].astype(object).where(df["rating"].notna(), "N/A").astype(str)
+    precio = df["priceLevel"].fillna("N/A").astype(str)
+    return (
+        "<b>" + _escapar(df["name"]) + "</b><br>"
+        + _escapar(df["address"]) + "<br>"
+        + "Rating: " + rating + "<br>"
+        + "Price Level: " + precio + "<br>"
+    )
+
+
+# Color por priceLevel: gris si no tiene, rojo si es un nivel no listado.
+# Se decide una vez por categoría y se expande con los códigos (sin if/elif por fila)
+def colores_precio(price_level):
+    categorias = price_level.astype("category")
+    paleta = np.array([COLORES_PRECIO.get(c, "red") for c in categorias.cat.categories] + ["gray"])
+    # El código -1 (sin precio) toma el último color de la paleta
+    return pd.Series(pd.Categorical(paleta[categorias.cat.codes.to_numpy()]), index=price_level.index)
+
+
+def hash_csv(ruta, tam_bloque=1 << 20):
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(tam_bloque), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+# (df, popups, colores) de un CSV de lugares; popups y colores salen de la caché si
+# ya se calcularon para este mismo contenido
+def artefactos_mapa(ruta_csv, directorio=DIRECTORIO_CACHE):
+    df = pd.read_csv(ruta_csv)
+    ruta_cache = os.path.join(directorio, f"{hash_csv(ruta_csv)}_v{VERSION_ARTEFACTOS}.pkl")
+    if os.path.exists(ruta_cache):
+        with open(ruta_cache, "rb") as f:
+            artefactos = pickle.load(f)
+    else:
+        artefactos = {"popups": popups_html(df), "colores": colores_precio(df["priceLevel"])}
+        os.makedirs(directorio, exist_ok=True)
+        with open(ruta_cache, "wb") as f:
+            pickle.dump(artefactos, f)
+    return df, artefactos["popups"], artefactos["colores"]
+
+
+def agregar_cluster(mapa, df, colores, popups=None, nombre="Taquerías"):
+    popups = popups_html(df) if popups is None else popups
+    # Sin coordenadas no hay marcador (Leaflet falla con NaN)
+    validas = (df["lat"].notna() & df["lng"].notna()).to_numpy()
+    df, colores, popups = df[validas], colores[validas], popups[validas]
+    datos = list(zip(
+        df["lat"].to_numpy(dtype=float).tolist(),
+        df["lng"].to_numpy(dtype=float).tolist(),
+        popups.tolist(),
+        colores.tolist(),
+    ))
+    return FastMarkerCluster(datos, callback=CALLBACK_MARCADOR, name=nombre).add_to(mapa)
+
+
+# Un folium.Marker por fila (el modo original; útil con pocos puntos), en una capa
+def agregar_marcadores(mapa, df, colores, popups=None, nombre="Taquerías"):
+    popups = popups_html(df) if popups is None else popups
+    capa = folium.FeatureGroup(name=nombre).add_to(mapa)
+    for lat, lng, popup, color in zip(df["lat"], df["lng"], popups, colores):
+        folium.Marker(
+            location=[lat, lng],
+            popup=folium.Popup(popup, max_width=300),
+            icon=folium.Icon(color=color, icon="cutlery", prefix="fa")
+        ).add_to(capa)
+    return capa
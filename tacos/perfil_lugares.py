@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# Carga tipada de la tabla de lugares y perfil de todas sus columnas en una pasada.
+# Los scripts de análisis (analisisRatings.py, tacosAnalisis.py, tacoFinal/taco.py,
+# tacoFinal/taco2.py) leen el CSV una vez y toman del perfil los conteos de nulos,
+# los resúmenes tipo describe(), los conteos por nivel de precio y los subconjuntos
+# (con rating, top por reseñas...), que se guardan como máscaras y no como copias.
+# rating se queda en float64 para que medias y percentiles salgan iguales que con
+# df['rating'] leído sin tipos.
+TIPOS_LUGARES = {
+    "name": "string",
+    "address": "string",
+    "lat": "float64",
+    "lng": "float64",
+    "rating": "float64",
+    "priceLevel": "category",
+    "website": "string",
+}
+PERCENTILES = (0.25, 0.5, 0.75)
+
+
+def leer_lugares(ruta):
+    df = pd.read_csv(ruta, dtype=TIPOS_LUGARES)
+    # En los CSV el conteo viene como 42580.0; se lee como float y se pasa a entero con nulos
+    if "userRatingCount" in df:
+        df["userRatingCount"] = df["userRatingCount"].astype("Int32")
+    return df
+
+
+# Equivalente a Series.describe(percentiles) con un solo ordenamiento
+# (ordenados=True si los valores ya vienen ordenados)
+def describir(valores, percentiles=PERCENTILES, ordenados=False):
+    valores = np.asarray(valores, dtype=np.float64)
+    if not ordenados:
+        valores = np.sort(valores)
+    n = len(valores)
+    resumen = {"count": float(n)}
+    if n:
+        resumen["mean"] = valores.mean()
+        resumen["std"] = valores.std(ddof=1) if n > 1 else np.nan
+        resumen["min"] = valores[0]
+        for p, v in zip(percentiles, np.percentile(valores, np.multiply(percentiles, 100))):
+            resumen[f"{p * 100:g}%"] = v
+        resumen["max"] = valores[-1]
+    return pd.Series(resumen)
+
+
+def _flotantes(serie):
+    return serie.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+# Igual que pd.Series(valores).value_counts().sort_index() para un arreglo ya ordenado
+def _conteo_ordenados(valores):
+    cortes = np.flatnonzero(np.diff(valores)) + 1
+    inicios = np.r_[0, cortes] if len(valores) else np.empty(0, dtype=np.intp)
+    return pd.Series(np.diff(np.r_[inicios, len(valores)]), index=valores[inicios], name="count")
+
+
+class PerfilLugares:
+    def __init__(self, df, percentiles=(0.25, 0.5, 0.75, 0.9), cuantil_top=0.75):
+        self.df = df
+        self.n = len(df)
+        self.nulos = df.isna().sum()
+        self.validos = self.n - self.nulos
+
+        rating = _flotantes(df["rating"])
+        conteos = _flotantes(df["userRatingCount"])
+        self.ratings = rating
+        self.conteos = conteos
+
+        # Un solo ordenamiento de los ratings da el describe() y el conteo por valor
+        self.con_rating = ~np.isnan(rating)
+        ordenados = np.sort(rating[self.con_rating])
+        self.rating = describir(ordenados, percentiles, ordenados=True)
+        self.conteo_ratings = _conteo_ordenados(ordenados)
+        self.resenas = describir(conteos[~np.isnan(conteos)], percentiles)
+
+        # Top por número de reseñas entre los que tienen rating
+        self.cuantil_top = cuantil_top
+        self.umbral_top = (
+            float(np.nanquantile(conteos[self.con_rating], cuantil_top)) if self.con_rating.any() else np.nan
+        )
+        self.top = self.con_rating & (conteos >= self.umbral_top)
+        self.rating_top = describir(rating[self.top])
+
+        # Con los códigos de la categoría salen a la vez la máscara y los conteos por nivel
+        precio = df["priceLevel"].astype("category")
+        codigos = precio.cat.codes.to_numpy()
+        self.con_precio = codigos >= 0
+        niveles = precio.cat.categories
+        self.precios = pd.Series(
+            np.bincount(codigos[self.con_precio], minlength=len(niveles)),
+            index=pd.CategoricalIndex(niveles, categories=niveles, name="priceLevel"), name="count",
+        ).sort_values(ascending=False, kind="stable")
+
+    def filas(self, mascara):
+        return self.df[mascara]
+
+    def __repr__(self):
+        return (f"PerfilLugares({self.n} lugares, {int(self.con_rating.sum())} con rating, "
+                f"{int(self.con_precio.sum())} con priceLevel)")
@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import pandas as pd
+
+from crawler_places import BBOX_CDMX, CrawlerPlaces, celdas_cuadricula, payload_rectangulo
+from cuadricula_adaptativa import expansion_adaptativa
+from deduplicador import DeduplicadorLugares
+from diario_respuestas import TTL_HORAS, DiarioRespuestas
+from salida_lugares import SalidaLugares
+
+# Varios trabajos (consulta, ciudad/bbox, estrategia de cuadrícula) bajo un mismo
+# límite de tasa y un presupuesto total de solicitudes. Las solicitudes de todos
+# los trabajos se intercalan: cada lugar libre se le da al trabajo con mayor
+# rendimiento esperado (lugares nuevos por solicitud), que empieza con el valor
+# estimado del trabajo y se va corrigiendo con lo observado. Así, si el presupuesto
+# se acaba, se gastó en las consultas que más lugares daban.
+# Uso:
+#   python planificador_crawl.py --consultas tacos tortas pozole --ciudades CDMX GDL MTY
+#   python planificador_crawl.py --trabajos trabajos.json   (lista de objetos con
+#     consulta, ciudad, bbox opcional, estrategia, grid_size, rendimiento_esperado)
+CIUDADES = {
+    "CDMX": BBOX_CDMX,
+    "GDL": (20.55, -103.45, 20.76, -103.25),
+    "MTY": (25.60, -100.43, 25.78, -100.19),
+    "PUE": (18.98, -98.28, 19.10, -98.14),
+}
+# USD por 1000 solicitudes (Text Search con campos Enterprise + Atmosphere); ajustar
+# a la tarifa vigente. Las respuestas que salen del diario no cuestan.
+COSTO_POR_MIL = 40.0
+# Cuántas celdas "pesa" el rendimiento esperado inicial frente a lo observado
+PESO_PREVIO = 5
+
+
+class TrabajoCrawl:
+    def __init__(self, consulta, ciudad, bbox=None, estrategia="fija", grid_size=None,
+                 rendimiento_esperado=5.0):
+        self.consulta = consulta
+        self.ciudad = ciudad
+        self.nombre = f"{consulta} @ {ciudad}"
+        bbox = bbox or CIUDADES[ciudad]
+        adaptativa = estrategia == "adaptativa"
+        self.estrategia = estrategia
+        self.pendientes = deque(celdas_cuadricula(bbox, grid_size or (4 if adaptativa else 15)))
+        self.expandir = expansion_adaptativa() if adaptativa else None
+        self.rendimiento_esperado = rendimiento_esperado
+
+        # Cada trabajo deduplica por separado: un lugar puede salir en "tacos" y en "tortas"
+        self.deduplicador = DeduplicadorLugares()
+        self.estadisticas = {"solicitudes": 0, "reintentos": 0, "errores": 0, "del_diario": 0}
+        self.celdas = 0
+        self.lugares = 0
+        self.inicio = None
+        self.fin = None
+
+    # Lugares nuevos esperados por celda: promedio observado suavizado con el estimado inicial
+    def rendimiento(self):
+        return (self.lugares + PESO_PREVIO * self.rendimiento_esperado) / (self.celdas + PESO_PREVIO)
+
+
+class PlanificadorCrawl:
+    def __init__(self, crawler, trabajos, presupuesto=None, costo_por_mil=COSTO_POR_MIL):
+        self.crawler = crawler
+        self.trabajos = list(trabajos)
+        self.presupuesto = presupuesto
+        self.costo_por_mil = costo_por_mil
+
+    def _siguiente(self):
+        activos = [t for t in self.trabajos if t.pendientes]
+        return max(activos, key=TrabajoCrawl.rendimiento) if activos else None
+
+    # El presupuesto se revisa antes de lanzar cada celda; los reintentos de las que
+    # ya están en vuelo pueden pasarlo por unas cuantas solicitudes
+    def _hay_presupuesto(self, en_vuelo):
+        return self.presupuesto is None or self.crawler.estadisticas["solicitudes"] + en_vuelo < self.presupuesto
+
+    async def ejecutar(self, salida):
+        crawler = self.crawler
+        async with crawler.abrir_sesion() as sesion:
+            en_vuelo = {}
+
+            def lanzar():
+                while len(en_vuelo) < crawler.concurrencia and self._hay_presupuesto(len(en_vuelo)):
+                    trabajo = self._siguiente()
+                    if trabajo is None:
+                        return
+                    clave, rectangulo = trabajo.pendientes.popleft()
+                    if trabajo.inicio is None:
+                        trabajo.inicio = time.perf_counter()
+                    tarea = asyncio.ensure_future(crawler.buscar(
+                        sesion,
+                        payload_rectangulo(trabajo.consulta, rectangulo),
+                        etiqueta=f"{trabajo.nombre} {clave}",
+                        estadisticas=trabajo.estadisticas,
+                    ))
+                    en_vuelo[tarea] = (trabajo, clave, rectangulo)
+
+            lanzar()
+            while en_vuelo:
+                listas, _ = await asyncio.wait(en_vuelo, return_when=asyncio.FIRST_COMPLETED)
+                for tarea in listas:
+                    trabajo, clave, rectangulo = en_vuelo.pop(tarea)
+                    datos = tarea.result()
+                    trabajo.celdas += 1
+                    trabajo.fin = time.perf_counter()
+                    if datos is None:
+                        continue
+
+                    nuevos = trabajo.deduplicador.filtrar(datos.get("places", []))
+                    salida.agregar(nuevos, consulta=trabajo.consulta, ciudad=trabajo.ciudad)
+                    trabajo.lugares += len(nuevos)
+                    # Las subdivisiones van primero: una celda saturada promete más lugares
+                    if trabajo.expandir is not None:
+                        trabajo.pendientes.extendleft(reversed(trabajo.expandir(clave, rectangulo, datos)))
+                lanzar()
+
+    def reporte(self):
+        filas = []
+        for t in self.trabajos:
+            e = t.estadisticas
+            duracion = (t.fin - t.inicio) if t.inicio is not None else 0.0
+            filas.append({
+                "trabajo": t.nombre,
+                "estrategia": t.estrategia,
+                "celdas": t.celdas,
+                "pendientes": len(t.pendientes),
+                "solicitudes": e["solicitudes"],
+                "del_diario": e["del_diario"],
+                "errores": e["errores"],
+                "lugares": t.lugares,
+                "lugares_por_solicitud": t.lugares / e["solicitudes"] if e["solicitudes"] else float("nan"),
+                "solicitudes_por_s": e["solicitudes"] / duracion if duracion else float("nan"),
+                "costo_usd": e["solicitudes"] * self.costo_por_mil / 1000,
+            })
+        return pd.DataFrame(filas)
+
+
+def leer_trabajos(args):
+    if args.trabajos:
+        with open(args.trabajos, encoding="utf-8") as f:
+            return [TrabajoCrawl(**trabajo) for trabajo in json.load(f)]
+    return [
+        TrabajoCrawl(consulta, ciudad, estrategia=args.estrategia, grid_size=args.grid_size)
+        for consulta in args.consultas
+        for ciudad in args.ciudades
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl de varias consultas y ciudades con Places API")
+    parser.add_argument("--trabajos", help="JSON con la lista de trabajos")
+    parser.add_argument("--consultas", nargs="+", default=["Tacos"])
+    parser.add_argument("--ciudades", nargs="+", default=["CDMX"], choices=sorted(CIUDADES))
+    parser.add_argument("--estrategia", choices=["fija", "adaptativa"], default="adaptativa")
+    parser.add_argument("--grid-size", type=int, default=None)
+    parser.add_argument("--presupuesto", type=int, default=None, help="Máximo de solicitudes a la API")
+    parser.add_argument("--tasa", type=float, default=10, help="Solicitudes por segundo")
+    parser.add_argument("--salida", default="lugares_crawl.csv")
+    parser.add_argument("--diario", default="respuestas_places.sqlite")
+    parser.add_argument("--ttl-horas", type=float, default=TTL_HORAS)
+    parser.add_argument("--url", default=None, help="Otro endpoint (p. ej. el de stub_places.py)")
+    args = parser.parse_args()
+
+    if args.url:
+        api_key = "stub"
+    else:
+        from llave import GOOGLE_MAPS_API_KEY as api_key
+
+    trabajos = leer_trabajos(args)
+    with DiarioRespuestas(args.diario, args.ttl_horas) as diario:
+        opciones = {"url": args.url} if args.url else {}
+        crawler = CrawlerPlaces(api_key, tasa=args.tasa, diario=diario, **opciones)
+        planificador = PlanificadorCrawl(crawler, trabajos, presupuesto=args.presupuesto)
+
+        print(f"🚀 {len(trabajos)} trabajos, presupuesto: {args.presupuesto or 'sin límite'} solicitudes")
+        inicio = time.perf_counter()
+        with SalidaLugares(args.salida, args.salida.rsplit(".", 1)[0] + "_parquet") as salida:
+            asyncio.run(planificador.ejecutar(salida))
+        duracion = time.perf_counter() - inicio
+
+    reporte = planificador.reporte()
+    print(reporte.to_string(index=False, float_format="{:.2f}".format))
+    total = crawler.estadisticas["solicitudes"]
+    print(f"\n📊 {total} solicitudes en {duracion:.1f} s ({total / max(duracion, 1e-9):.2f} req/s), "
+          f"costo ≈ ${reporte['costo_usd'].sum():.2f} USD, {salida.filas} lugares en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
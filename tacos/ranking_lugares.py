@@ -0,0 +1,119 @@
+import argparse
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from agregacion_cuadricula import BBOX_CDMX, indices_celda
+
+# Ranking de taquerías con un puntaje que corrige el rating por el número de opiniones,
+# en lugar de ordenar por rating crudo tras un filtro (userRatingCount >= 20) o de
+# quitar a mano los 5.0 y 1.0:
+#   - bayesiano: (v·R + m·C) / (v + m), con v opiniones, R rating, C rating promedio
+#     global y m opiniones "previas" (pocas opiniones → cerca del promedio);
+#   - wilson: límite inferior del intervalo de Wilson de la proporción (R-1)/4,
+#     regresado a la escala 1-5 (pocas opiniones → límite bajo).
+# El índice se ordena una vez: global y, para cada nivel de precio y cada celda de la
+# cuadrícula, un bloque contiguo ya ordenado, así que top-N es solo tomar una rebanada.
+SIN_PRECIO = "SIN_PRECIO"
+
+
+def promedio_bayesiano(rating, conteo, m=20, c=None):
+    rating = np.asarray(rating, dtype=float)
+    conteo = np.asarray(conteo, dtype=float)
+    c = rating.mean() if c is None else c
+    return (conteo * rating + m * c) / (conteo + m)
+
+
+def limite_wilson(rating, conteo, z=1.96):
+    p = (np.asarray(rating, dtype=float) - 1) / 4
+    n = np.asarray(conteo, dtype=float)
+    centro = p + z ** 2 / (2 * n)
+    margen = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2))
+    return 1 + 4 * (centro - margen) / (1 + z ** 2 / n)
+
+
+class IndiceRanking:
+    def __init__(self, df, metodo="bayesiano", m=20, z=1.96, bbox=BBOX_CDMX, grid_size=10):
+        df = df[df["rating"].notna() & (df["userRatingCount"] > 0)]
+        rating = df["rating"].to_numpy(dtype=float)
+        conteo = df["userRatingCount"].to_numpy(dtype=float)
+
+        if metodo == "bayesiano":
+            puntaje = promedio_bayesiano(rating, conteo, m)
+        elif metodo == "wilson":
+            puntaje = limite_wilson(rating, conteo, z)
+        else:
+            raise ValueError(f"Método de ranking desconocido: {metodo}")
+
+        i, j = indices_celda(df["lat"], df["lng"], bbox, grid_size)
+        df = df.assign(
+            puntaje=puntaje,
+            celda=np.where(i >= 0, i * grid_size + j, -1),
+            nivel_precio=df["priceLevel"].astype(object).fillna(SIN_PRECIO),
+        )
+        self.metodo = metodo
+        self.grid_size = grid_size
+
+        orden = np.argsort(-puntaje, kind="stable")
+        self.global_ = df.iloc[orden].reset_index(drop=True)
+        self.grupos = {columna: self._particionar(columna) for columna in ("nivel_precio", "celda")}
+
+    # Ordena por (grupo, puntaje desc) y guarda dónde empieza y termina cada grupo
+    def _particionar(self, columna):
+        codigos, claves = pd.factorize(self.global_[columna], sort=True)
+        # global_ ya está ordenado por puntaje; un sort estable por grupo lo conserva
+        orden = np.argsort(codigos, kind="stable")
+        ordenado = self.global_.iloc[orden].reset_index(drop=True)
+        limites = np.searchsorted(codigos[orden], np.arange(len(claves) + 1))
+        rangos = {clave: (limites[k], limites[k + 1]) for k, clave in enumerate(claves)}
+        return ordenado, rangos
+
+    def top(self, n=10, precio=None, celda=None):
+        if precio is not None and celda is not None:
+            raise ValueError("Filtra por precio o por celda, no por ambos.")
+        if precio is None and celda is None:
+            return self.global_.iloc[:n]
+        columna, clave = ("nivel_precio", precio) if precio is not None else ("celda", celda)
+        ordenado, rangos = self.grupos[columna]
+        inicio, fin = rangos.get(clave, (0, 0))
+        return ordenado.iloc[inicio:min(fin, inicio + n)]
+
+    def claves(self, columna):
+        return list(self.grupos[columna][1])
+
+    def guardar(self, ruta):
+        with open(ruta, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def cargar(ruta):
+        with open(ruta, "rb") as f:
+            return pickle.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ranking de taquerías por puntaje ajustado")
+    parser.add_argument("--entrada", default="tacos_CDMX_sorted.csv")
+    parser.add_argument("--metodo", choices=["bayesiano", "wilson"], default="bayesiano")
+    parser.add_argument("-m", type=float, default=20, help="Opiniones previas del promedio bayesiano")
+    parser.add_argument("-n", type=int, default=10)
+    parser.add_argument("--guardar", default=None, help="Ruta .pkl para guardar el índice")
+    args = parser.parse_args()
+
+    indice = IndiceRanking(pd.read_csv(args.entrada), metodo=args.metodo, m=args.m)
+    columnas = ["name", "rating", "userRatingCount", "priceLevel", "puntaje"]
+
+    print(f"🏆 Top {args.n} ({args.metodo}):")
+    print(indice.top(args.n)[columnas].to_string(index=False))
+    for precio in indice.claves("nivel_precio"):
+        print(f"\n💲 {precio}:")
+        print(indice.top(args.n, precio=precio)[columnas].to_string(index=False))
+
+    if args.guardar:
+        indice.guardar(args.guardar)
+        print(f"\n📁 Índice guardado en {args.guardar}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Regresión lineal por mínimos cuadrados sin tener la tabla en memoria.
+# Por cada bloque solo se acumulan las estadísticas suficientes XᵀX, Xᵀy, yᵀy,
+# Σy y n; con ellas salen los mismos coeficientes y R² que LinearRegression /
+# np.polyfit sobre la tabla completa. Dos acumuladores se suman con combinar(),
+# así que cada proceso (o cada ciudad) puede ajustar su parte por separado.
+NIVELES_PRECIO = [
+    "PRICE_LEVEL_INEXPENSIVE",
+    "PRICE_LEVEL_MODERATE",
+    "PRICE_LEVEL_EXPENSIVE",
+    "PRICE_LEVEL_VERY_EXPENSIVE",
+]
+COLUMNAS_REGRESION = ["rating", "userRatingCount", "priceLevel"]
+
+
+# Mismo filtro que taco2.py: con rating, al menos `min_resenas` opiniones y sin 5.0 ni 1.0
+def filtro_realista(bloque, min_resenas=10):
+    return (
+        bloque["rating"].notna()
+        & (bloque["userRatingCount"] >= min_resenas)
+        & (bloque["rating"] != 5.0)
+        & (bloque["rating"] != 1.0)
+    )
+
+
+# Nombres de las columnas de la matriz de diseño
+def nombres_variables(log_conteo=False, precios=False):
+    nombres = ["intercepto", "log_userRatingCount" if log_conteo else "userRatingCount"]
+    if precios:
+        # El primer nivel (INEXPENSIVE) es la referencia; sin precio lleva su propia variable
+        nombres += NIVELES_PRECIO[1:] + ["SIN_PRECIO"]
+    return nombres
+
+
+def matriz_diseno(bloque, log_conteo=False, precios=False):
+    conteo = bloque["userRatingCount"].to_numpy(dtype=float)
+    columnas = [np.ones(len(bloque)), np.log1p(conteo) if log_conteo else conteo]
+    if precios:
+        nivel = bloque["priceLevel"].astype(object).to_numpy()
+        columnas += [(nivel == n).astype(float) for n in NIVELES_PRECIO[1:]]
+        columnas.append(pd.isna(nivel).astype(float))
+    return np.column_stack(columnas)
+
+
+class MinimosCuadradosStreaming:
+    def __init__(self, nombres):
+        self.nombres = list(nombres)
+        p = len(self.nombres)
+        self.xtx = np.zeros((p, p))
+        self.xty = np.zeros(p)
+        self.yty = 0.0
+        self.suma_y = 0.0
+        self.n = 0
+
+    def actualizar(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+        self.yty += float(y @ y)
+        self.suma_y += float(y.sum())
+        self.n += len(y)
+        return self
+
+    def combinar(self, otro):
+        if otro.nombres != self.nombres:
+            raise ValueError("Solo se pueden combinar ajustes con las mismas variables.")
+        self.xtx += otro.xtx
+        self.xty += otro.xty
+        self.yty += otro.yty
+        self.suma_y += otro.suma_y
+        self.n += otro.n
+        return self
+
+    def coeficientes(self):
+        # Se escalan las columnas para que XᵀX quede bien condicionado (los conteos
+        # llegan a decenas de miles y la constante vale 1); si una variable nunca
+        # aparece, XᵀX es singular y se usa la solución de norma mínima
+        escala = np.sqrt(np.diag(self.xtx))
+        escala[escala == 0] = 1.0
+        a = self.xtx / np.outer(escala, escala)
+        b = self.xty / escala
+        try:
+            beta = np.linalg.solve(a, b)
+        except np.linalg.LinAlgError:
+            beta = np.linalg.lstsq(a, b, rcond=None)[0]
+        return pd.Series(beta / escala, index=self.nombres)
+
+    def r2(self):
+        beta = self.coeficientes().to_numpy()
+        sse = self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta
+        sst = self.yty - self.suma_y ** 2 / self.n
+        return 1 - sse / sst
+
+    def predecir(self, X):
+        return np.asarray(X, dtype=float) @ self.coeficientes().to_numpy()
+
+    def resumen(self):
+        coef = self.coeficientes()
+        lineas = [f"n = {self.n}, R² = {self.r2():.6f}"]
+        lineas += [f"  {nombre:<28} {valor: .9g}" for nombre, valor in coef.items()]
+        return "\n".join(lineas)
+
+
+# Ajuste de un CSV leído por bloques
+def ajustar_csv(ruta, tam_bloque=200_000, log_conteo=False, precios=False, min_resenas=10):
+    modelo = MinimosCuadradosStreaming(nombres_variables(log_conteo, precios))
+    for bloque in pd.read_csv(ruta, usecols=COLUMNAS_REGRESION, chunksize=tam_bloque):
+        bloque = bloque[filtro_realista(bloque, min_resenas)]
+        if len(bloque):
+            modelo.actualizar(matriz_diseno(bloque, log_conteo, precios), bloque["rating"].to_numpy())
+    return modelo
+
+
+def _ajustar_archivo(argumentos):
+    ruta, opciones = argumentos
+    return ajustar_csv(ruta, **opciones)
+
+
+# Un proceso por archivo (p. ej. una ciudad cada uno); los acumuladores se combinan al final.
+# Quien lo llame desde un script debe hacerlo dentro de if __name__ == "__main__".
+def ajustar_archivos(rutas, trabajadores=None, **opciones):
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        parciales = list(pool.map(_ajustar_archivo, [(ruta, opciones) for ruta in rutas]))
+    modelo = parciales[0]
+    for parcial in parciales[1:]:
+        modelo.combinar(parcial)
+    return modelo
@@ -0,0 +1,90 @@
+import glob
+import os
+
+import pandas as pd
+
+# Escritura incremental de los lugares del crawl: cada lote se agrega al CSV y se
+# escribe como una parte Parquet nueva en una carpeta, así la memoria no crece con
+# el número de consultas/ciudades y los resultados parciales ya se pueden leer
+# (pd.read_csv(ruta_csv) o pd.read_parquet(carpeta_parquet)) mientras el crawl sigue.
+# El esquema es fijo: mismas columnas y tipos en todos los lotes.
+ESQUEMA = {
+    "query": "string",
+    "city": "string",
+    "id": "string",
+    "name": "string",
+    "address": "string",
+    "lat": "float64",
+    "lng": "float64",
+    "rating": "float32",
+    "userRatingCount": "Int32",
+    "priceLevel": "string",
+    "website": "string",
+    "genAI": "string",
+}
+COLUMNAS = list(ESQUEMA)
+
+
+# Fila con el esquema fijo a partir de un lugar de la respuesta de Places
+def fila_lugar(place, consulta=None, ciudad=None):
+    return {
+        "query": consulta,
+        "city": ciudad,
+        "id": place.get("id"),
+        "name": (place.get("displayName") or {}).get("text"),
+        "address": place.get("formattedAddress"),
+        "lat": (place.get("location") or {}).get("latitude"),
+        "lng": (place.get("location") or {}).get("longitude"),
+        "rating": place.get("rating"),
+        "userRatingCount": place.get("userRatingCount"),
+        "priceLevel": place.get("priceLevel"),
+        "website": place.get("websiteUri"),
+        "genAI": ((place.get("generativeSummary") or {}).get("overview") or {}).get("text"),
+    }
+
+
+class SalidaLugares:
+    def __init__(self, ruta_csv="tacos_CDMX.csv", carpeta_parquet="tacos_CDMX_parquet", tam_lote=500):
+        self.ruta_csv = ruta_csv
+        self.carpeta_parquet = carpeta_parquet
+        self.tam_lote = tam_lote
+        self.pendientes = []
+        self.filas = 0
+        self.partes = 0
+
+        # Se empieza de cero: encabezado en el CSV y sin partes de corridas anteriores
+        pd.DataFrame(columns=COLUMNAS).to_csv(ruta_csv, index=False)
+        if carpeta_parquet is not None:
+            os.makedirs(carpeta_parquet, exist_ok=True)
+            for parte in glob.glob(os.path.join(carpeta_parquet, "parte_*.parquet")):
+                os.remove(parte)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def agregar(self, places, consulta=None, ciudad=None):
+        self.pendientes.extend(fila_lugar(place, consulta, ciudad) for place in places)
+        if len(self.pendientes) >= self.tam_lote:
+            self.vaciar()
+
+    def vaciar(self):
+        if not self.pendientes:
+            return
+        lote = pd.DataFrame(self.pendientes, columns=COLUMNAS).astype(ESQUEMA)
+        self.pendientes = []
+
+        lote.to_csv(self.ruta_csv, mode="a", header=False, index=False)
+        if self.carpeta_parquet is not None:
+            try:
+                lote.to_parquet(os.path.join(self.carpeta_parquet, f"parte_{self.partes:05d}.parquet"), index=False)
+                self.partes += 1
+            except ImportError:
+                print("⚠️ No se pudo guardar como Parquet. Instala pyarrow con: pip install pyarrow (solo se usará el CSV)")
+                self.carpeta_parquet = None
+        self.filas += len(lote)
+
+    def cerrar(self):
+        self.vaciar()
@@ -0,0 +1,190 @@
+import argparse
+import json
+import math
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from ranking_lugares import promedio_bayesiano
+
+# Servicio "¿qué hay cerca?": las mejores taquerías a menos de R metros de un punto.
+# Los lugares se ordenan una vez por celda de una cuadrícula (orden fila-mayor) y se
+# guardan los desplazamientos de cada celda (estilo CSR). Una consulta solo revisa
+# las filas de celdas que tocan el círculo: en cada fila las celdas son contiguas en
+# memoria, así que los candidatos salen de unas cuantas rebanadas, sin pandas.
+# Uso: python servicio_cercanos.py --puerto 8080
+#      curl "http://127.0.0.1:8080/cercanos?lat=19.4326&lng=-99.1332&radio_m=1000&n=5&min_rating=4.5"
+RADIO_TIERRA_M = 6_371_008.8
+METROS_POR_GRADO = 111_320.0
+COLUMNAS_RESPUESTA = ["name", "address", "lat", "lng", "rating", "userRatingCount", "priceLevel"]
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * RADIO_TIERRA_M * np.arcsin(np.sqrt(a))
+
+
+class IndiceCercanos:
+    def __init__(self, df, tam_celda_m=500, m=20):
+        df = df[df["lat"].notna() & df["lng"].notna()].reset_index(drop=True)
+        lat = df["lat"].to_numpy(dtype=float)
+        lng = df["lng"].to_numpy(dtype=float)
+
+        self.lat_min, self.lng_min = lat.min(), lng.min()
+        self.paso_lat = tam_celda_m / METROS_POR_GRADO
+        self.paso_lng = tam_celda_m / (METROS_POR_GRADO * np.cos(np.radians(lat.mean())))
+        self.filas = int((lat.max() - self.lat_min) // self.paso_lat) + 1
+        self.columnas = int((lng.max() - self.lng_min) // self.paso_lng) + 1
+
+        i = ((lat - self.lat_min) // self.paso_lat).astype(np.int64)
+        j = ((lng - self.lng_min) // self.paso_lng).astype(np.int64)
+        celda = i * self.columnas + j
+        orden = np.argsort(celda, kind="stable")
+        self.desplazamientos = np.concatenate([[0], np.cumsum(np.bincount(celda, minlength=self.filas * self.columnas))])
+
+        # Columnas ya en el orden de las celdas
+        rating = df["rating"].to_numpy(dtype=float)
+        conteo = df["userRatingCount"].fillna(0).to_numpy(dtype=float)
+        self.df = df.iloc[orden].reset_index(drop=True)
+        self.lat = lat[orden]
+        self.lng = lng[orden]
+        self.rating = rating[orden]
+        self.conteo = conteo[orden]
+        self.precio = df["priceLevel"].astype(object).fillna("SIN_PRECIO").to_numpy()[orden]
+        # "Mejores" = promedio bayesiano (ver ranking_lugares.py); sin rating van al final
+        con_rating = ~np.isnan(self.rating) & (self.conteo > 0)
+        self.puntaje = np.full(len(self.df), -np.inf)
+        self.puntaje[con_rating] = promedio_bayesiano(self.rating[con_rating], self.conteo[con_rating], m)
+
+    def __len__(self):
+        return len(self.df)
+
+    def _candidatos(self, lat, lng, radio_m):
+        dlat = radio_m / METROS_POR_GRADO
+        dlng = radio_m / (METROS_POR_GRADO * max(np.cos(np.radians(lat)), 1e-6))
+        i0 = max(0, int((lat - dlat - self.lat_min) // self.paso_lat))
+        i1 = min(self.filas - 1, int((lat + dlat - self.lat_min) // self.paso_lat))
+        j0 = max(0, int((lng - dlng - self.lng_min) // self.paso_lng))
+        j1 = min(self.columnas - 1, int((lng + dlng - self.lng_min) // self.paso_lng))
+        if i0 > i1 or j0 > j1:
+            return np.empty(0, dtype=np.int64)
+        rebanadas = [
+            np.arange(self.desplazamientos[i * self.columnas + j0], self.desplazamientos[i * self.columnas + j1 + 1])
+            for i in range(i0, i1 + 1)
+        ]
+        return np.concatenate(rebanadas)
+
+    # Posiciones y distancias (m) de las mejores n dentro del radio que pasan los filtros
+    def consultar(self, lat, lng, radio_m=1000, n=10, min_rating=None, min_resenas=None, precios=None):
+        idx = self._candidatos(lat, lng, radio_m)
+        distancia = haversine_m(lat, lng, self.lat[idx], self.lng[idx])
+        ok = distancia <= radio_m
+        if min_rating is not None:
+            ok &= self.rating[idx] >= min_rating
+        if min_resenas is not None:
+            ok &= self.conteo[idx] >= min_resenas
+        if precios:
+            ok &= np.isin(self.precio[idx], list(precios))
+        idx, distancia = idx[ok], distancia[ok]
+
+        # Mayor puntaje primero; a igual puntaje, la más cercana
+        orden = np.lexsort((distancia, -self.puntaje[idx]))[:n]
+        return idx[orden], distancia[orden]
+
+    def resultados(self, idx, distancia):
+        filas = self.df.iloc[idx][COLUMNAS_RESPUESTA].assign(distancia_m=np.round(distancia, 1))
+        # to_json deja tipos nativos de JSON (NaN → null)
+        return json.loads(filas.to_json(orient="records", force_ascii=False))
+
+
+def _parametros(consulta):
+    crudos = parse_qs(consulta)
+    valores = {k: v[-1] for k, v in crudos.items()}
+    flotante = lambda k: float(valores[k]) if k in valores else None
+    parametros = {
+        "lat": float(valores["lat"]),
+        "lng": float(valores["lng"]),
+        "radio_m": float(valores.get("radio_m", 1000)),
+        "n": int(valores.get("n", 10)),
+        "min_rating": flotante("min_rating"),
+        "min_resenas": flotante("min_resenas"),
+        "precios": crudos.get("precio"),  # se puede repetir: &precio=A&precio=B
+    }
+
+    # nan/inf no se pueden ubicar en la cuadrícula y n < 1 recortaría mal el top
+    for clave in ("lat", "lng", "radio_m", "min_rating", "min_resenas"):
+        if parametros[clave] is not None and not math.isfinite(parametros[clave]):
+            raise ValueError(f"{clave} debe ser un número finito")
+    if not -90 <= parametros["lat"] <= 90 or not -180 <= parametros["lng"] <= 180:
+        raise ValueError("lat/lng fuera de rango")
+    if parametros["radio_m"] <= 0:
+        raise ValueError("radio_m debe ser mayor que 0")
+    if parametros["n"] < 1:
+        raise ValueError("n debe ser al menos 1")
+    return parametros
+
+
+class ServidorCercanos(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, direccion, indice):
+        super().__init__(direccion, ManejadorCercanos)
+        self.indice = indice
+
+    @property
+    def url(self):
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+
+class ManejadorCercanos(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, estado, cuerpo):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/cercanos":
+            self._responder(404, {"error": "Ruta no encontrada; usa /cercanos?lat=..&lng=.."})
+            return
+        try:
+            parametros = _parametros(url.query)
+        except (KeyError, ValueError) as error:
+            self._responder(400, {"error": f"Parámetros inválidos: {error}"})
+            return
+        indice = self.server.indice
+        idx, distancia = indice.consultar(**parametros)
+        self._responder(200, {"total": len(idx), "lugares": indice.resultados(idx, distancia)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio de taquerías cercanas")
+    parser.add_argument("--entrada", default="tacos_CDMX_sorted.csv")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    parser.add_argument("--tam-celda", type=float, default=500, help="Lado de la celda del índice en metros")
+    args = parser.parse_args()
+
+    indice = IndiceCercanos(pd.read_csv(args.entrada), tam_celda_m=args.tam_celda)
+    servidor = ServidorCercanos((args.host, args.puerto), indice)
+    print(f"🌮 {len(indice)} taquerías indexadas; escuchando en {servidor.url}/cercanos")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
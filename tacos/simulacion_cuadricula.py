@@ -0,0 +1,49 @@
+from collections import deque
+
+from crawler_places import BBOX_CDMX, celdas_cuadricula, payload_rectangulo
+from cuadricula_adaptativa import expansion_adaptativa
+from stub_places import buscar_sinteticos, lugares_sinteticos
+
+# Solicitudes por lugar encontrado: cuadrícula fija vs. subdivisión adaptativa,
+# sobre lugares sintéticos con distinta concentración en el centro. Se simula la
+# respuesta de Places en memoria (primera página, máximo 20), sin red.
+# Uso: python simulacion_cuadricula.py
+ESCENARIOS = [
+    # (lugares, fracción en el centro)
+    (2_000, 0.3),
+    (5_000, 0.6),
+    (20_000, 0.8),
+]
+CUADRICULAS_FIJAS = [10, 15, 30]
+CUADRICULA_INICIAL = 4
+
+
+def simular(sinteticos, celdas, expandir=None):
+    lugares, lat, lng = sinteticos
+    pendientes = deque(celdas)
+    encontrados = set()
+    solicitudes = 0
+    while pendientes:
+        clave, rectangulo = pendientes.popleft()
+        datos = buscar_sinteticos(lugares, lat, lng, payload_rectangulo("Tacos", rectangulo))
+        solicitudes += 1
+        encontrados.update(p["id"] for p in datos["places"])
+        if expandir is not None:
+            pendientes.extend(expandir(clave, rectangulo, datos))
+    return solicitudes, len(encontrados)
+
+
+if __name__ == "__main__":
+    print(f"{'lugares':>8} | {'centro':>6} | {'estrategia':>14} | {'solicitudes':>11} | {'cobertura':>9} | {'sol./lugar':>10}")
+    for n, fraccion in ESCENARIOS:
+        sinteticos = lugares_sinteticos(n, fraccion_centro=fraccion)
+        total = len(sinteticos[0])
+
+        estrategias = [(f"fija {g}x{g}", celdas_cuadricula(BBOX_CDMX, g), None) for g in CUADRICULAS_FIJAS]
+        estrategias.append((f"adaptativa {CUADRICULA_INICIAL}x{CUADRICULA_INICIAL}",
+                            celdas_cuadricula(BBOX_CDMX, CUADRICULA_INICIAL), expansion_adaptativa()))
+
+        for nombre, celdas, expandir in estrategias:
+            solicitudes, encontrados = simular(sinteticos, celdas, expandir)
+            print(f"{total:>8} | {fraccion:>6.0%} | {nombre:>14} | {solicitudes:>11} "
+                  f"| {encontrados / total:>9.1%} | {solicitudes / max(encontrados, 1):>10.3f}")
@@ -0,0 +1,155 @@
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from crawler_places import BBOX_CDMX
+
+# Servidor local que imita POST /v1/places:searchText para probar el crawler sin
+# gastar cuota: lugares sintéticos (más densos en el centro), máximo 20 por
+# respuesta con nextPageToken, límite de tasa con 429, errores 5xx aleatorios y
+# latencia configurable. Respeta X-Goog-FieldMask a nivel de campo de primer nivel.
+MAX_RESULTADOS = 20
+NIVELES_PRECIO = ["PRICE_LEVEL_INEXPENSIVE", "PRICE_LEVEL_MODERATE", "PRICE_LEVEL_EXPENSIVE"]
+
+
+# Lugares sintéticos: mezcla de un núcleo denso (centro) y un fondo uniforme
+def lugares_sinteticos(n=5000, bbox=BBOX_CDMX, fraccion_centro=0.6, semilla=0):
+    rng = np.random.default_rng(semilla)
+    lat_min, lng_min, lat_max, lng_max = bbox
+    n_centro = int(n * fraccion_centro)
+
+    lat = np.concatenate([
+        rng.normal(19.4326, 0.025, n_centro),
+        rng.uniform(lat_min, lat_max, n - n_centro),
+    ])
+    lng = np.concatenate([
+        rng.normal(-99.1332, 0.025, n_centro),
+        rng.uniform(lng_min, lng_max, n - n_centro),
+    ])
+    dentro = (lat >= lat_min) & (lat <= lat_max) & (lng >= lng_min) & (lng <= lng_max)
+    lat, lng = lat[dentro], lng[dentro]
+
+    lugares = []
+    for k in range(len(lat)):
+        lugares.append({
+            "id": f"stub{k:07d}",
+            "displayName": {"text": f"Taquería {k}", "languageCode": "es"},
+            "formattedAddress": f"Calle {k % 500}, Ciudad de México",
+            "location": {"latitude": float(lat[k]), "longitude": float(lng[k])},
+            "rating": round(float(rng.uniform(3, 5)), 1),
+            "userRatingCount": int(rng.integers(1, 2000)),
+            "priceLevel": NIVELES_PRECIO[k % len(NIVELES_PRECIO)],
+            "websiteUri": f"https://taqueria{k}.example.com",
+            "generativeSummary": {"overview": {"text": f"Tacos al pastor {k}"}},
+        })
+    return lugares, lat, lng
+
+
+# Respuesta de searchText sobre los lugares sintéticos (primera página o la de pageToken)
+def buscar_sinteticos(lugares, lat, lng, payload):
+    rect = payload["locationRestriction"]["rectangle"]
+    dentro = np.flatnonzero(
+        (lat >= rect["low"]["latitude"]) & (lat < rect["high"]["latitude"])
+        & (lng >= rect["low"]["longitude"]) & (lng < rect["high"]["longitude"])
+    )
+    inicio = int(payload.get("pageToken") or 0)
+    pagina = dentro[inicio:inicio + MAX_RESULTADOS]
+    respuesta = {"places": [lugares[k] for k in pagina]}
+    if inicio + MAX_RESULTADOS < len(dentro):
+        respuesta["nextPageToken"] = str(inicio + MAX_RESULTADOS)
+    return respuesta
+
+
+class ServidorPlaces(ThreadingHTTPServer):
+    daemon_threads = True
+
+    # `sinteticos` es la tupla (lugares, lat, lng) de lugares_sinteticos
+    def __init__(self, direccion=("127.0.0.1", 0), sinteticos=None, tasa=10, prob_error=0.0,
+                 latencia=0.05, semilla=0):
+        super().__init__(direccion, ManejadorPlaces)
+        self.lugares, self.lat, self.lng = sinteticos or lugares_sinteticos(semilla=semilla)
+        self.tasa = tasa
+        self.prob_error = prob_error
+        self.latencia = latencia
+        self.rng = np.random.default_rng(semilla)
+        self.llegadas = deque()
+        self.candado = threading.Lock()
+        self.conteos = {"solicitudes": 0, "429": 0, "5xx": 0}
+
+    @property
+    def url(self):
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}/v1/places:searchText"
+
+    # Ventana deslizante de 1 s: más de `tasa` llegadas → 429
+    def admitir(self):
+        with self.candado:
+            ahora = time.monotonic()
+            self.conteos["solicitudes"] += 1
+            while self.llegadas and ahora - self.llegadas[0] >= 1:
+                self.llegadas.popleft()
+            if len(self.llegadas) >= self.tasa:
+                self.conteos["429"] += 1
+                return 429
+            self.llegadas.append(ahora)
+            if self.rng.random() < self.prob_error:
+                self.conteos["5xx"] += 1
+                return 503
+            return 200
+
+    def buscar(self, payload):
+        return buscar_sinteticos(self.lugares, self.lat, self.lng, payload)
+
+    def iniciar(self):
+        hilo = threading.Thread(target=self.serve_forever, daemon=True)
+        hilo.start()
+        return self
+
+
+class ManejadorPlaces(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, estado, cuerpo, encabezados=()):
+        datos = json.dumps(cuerpo).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        for clave, valor in encabezados:
+            self.send_header(clave, valor)
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.endswith("places:searchText"):
+            self._responder(404, {"error": {"code": 404, "message": "Not found"}})
+            return
+
+        time.sleep(self.server.latencia)
+        estado = self.server.admitir()
+        if estado == 429:
+            self._responder(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}, [("Retry-After", "1")])
+            return
+        if estado != 200:
+            self._responder(estado, {"error": {"code": estado, "status": "UNAVAILABLE"}})
+            return
+
+        respuesta = self.server.buscar(payload)
+        mascara = self.headers.get("X-Goog-FieldMask", "*")
+        if mascara != "*":
+            campos = {c.split(".", 1)[1] for c in mascara.split(",") if c.startswith("places.")}
+            respuesta["places"] = [{k: v for k, v in p.items() if k in campos} for p in respuesta["places"]]
+        self._responder(200, respuesta)
+
+
+if __name__ == "__main__":
+    servidor = ServidorPlaces(("127.0.0.1", 8765))
+    print(f"🧪 Stub de Places en {servidor.url} ({len(servidor.lugares)} lugares)")
+    servidor.serve_forever()
@@ -1,8 +1,13 @@
-import pandas as pd
-import numpy as np
+import os
+import sys
+
+# perfil_lugares.py vive en tacos/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from perfil_lugares import PerfilLugares, leer_lugares
 
 # Leer el archivo limpio y ya ordenado
-df = pd.read_csv("tacos_CDMX_sorted.csv")
+df = leer_lugares("tacos_CDMX_sorted.csv")
+perfil = PerfilLugares(df)
 
 print("Columnas disponibles:")
 print(df.columns.tolist())
@@ -11,11 +16,11 @@ print(df.columns.tolist())
 print(df)
 
 
-# Contar entradas válidas (no vacías) en columnas clave
-rating_count = df['rating'].notna().sum()
-priceLevel_count = df['priceLevel'].notna().sum()
-website_count = df['website'].notna().sum()
-lat_count = df['lat'].notna().sum()
+# Contar entradas válidas (no vacías) en columnas clave (todas en la misma pasada)
+rating_count = perfil.validos['rating']
+priceLevel_count = perfil.validos['priceLevel']
+website_count = perfil.validos['website']
+lat_count = perfil.validos['lat']
 
 # Mostrar conteo
 print("Con lat:", lat_count)
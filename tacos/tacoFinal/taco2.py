@@ -1,10 +1,15 @@
-import pandas as pd
-import numpy as np
+import os
+import sys
 import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
 
-# Leer el archivo limpio y ya ordenado
-df = pd.read_csv("tacos_CDMX_sorted.csv")
+# perfil_lugares.py y regresion_streaming.py viven en tacos/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from perfil_lugares import PerfilLugares, leer_lugares
+from regresion_streaming import MinimosCuadradosStreaming, matriz_diseno, nombres_variables
+
+# Leer el archivo limpio y ya ordenado (tipado: conteos Int32, priceLevel category)
+df = leer_lugares("tacos_CDMX_sorted.csv")
+perfil = PerfilLugares(df)
 
 # Seleccionar y ordenar todas las columnas que se van a usar
 dfCompleto = df[['name','address', 'userRatingCount','rating', 'priceLevel', 'website', 'lat', 'lng']]  
@@ -19,7 +24,7 @@ dfUserRatingCount = dfUserRatingCount.sort_values(by='userRatingCount', ascendin
 # Mostrar las primeras filas del DataFrame ordenado
 print(dfUserRatingCount)
 
-mediaRating = dfUserRatingCount['rating'].mean()
+mediaRating = perfil.rating['mean']
 print("Media de rating:", mediaRating)
 
 # limpiar solo las taquerías con ratings válidos y al menos 10 calificaciones, además de excluir las que tienen rating perfecto (5.0) o muy bajo (1.0).
@@ -45,19 +50,29 @@ mediaRealista = dfFiltrado['rating'].mean()
 print("Media de rating filtrada:", mediaRealista)
 
 # Preparar las variables para la regresión
-X = dfFiltrado[['userRatingCount']]  # variable independiente (X)
-y = dfFiltrado['rating']             # variable dependiente (y)
+dfRegresion = dfCompleto.loc[dfFiltrado.index]
+X = dfFiltrado['userRatingCount'].to_numpy(dtype=float)  # variable independiente (X)
+y = dfFiltrado['rating'].to_numpy(dtype=float)           # variable dependiente (y)
 
-# Crear el modelo
-modelo = LinearRegression()
-modelo.fit(X, y)
+# Crear el modelo: mínimos cuadrados con XᵀX y Xᵀy sobre la tabla ya cargada y filtrada,
+# da la misma recta que LinearRegression (ajustar_csv hace lo mismo por bloques del CSV
+# cuando la tabla no cabe en memoria)
+modelo = MinimosCuadradosStreaming(nombres_variables()).actualizar(matriz_diseno(dfRegresion), y)
+coeficientes = modelo.coeficientes()
 
 # Hacer predicciones
-y_pred = modelo.predict(X)
+y_pred = coeficientes['intercepto'] + coeficientes['userRatingCount'] * X
 
 # Mostrar coeficientes
-print("Coeficiente (pendiente):", modelo.coef_[0])
-print("Intercepto:", modelo.intercept_)
+print("Coeficiente (pendiente):", coeficientes['userRatingCount'])
+print("Intercepto:", coeficientes['intercepto'])
+print("R²:", modelo.r2())
+
+# Variantes: log(1 + número de calificaciones) y nivel de precio como variables indicadoras
+print("\nRegresión con log(userRatingCount) y nivel de precio:")
+modeloPrecios = MinimosCuadradosStreaming(nombres_variables(log_conteo=True, precios=True))
+modeloPrecios.actualizar(matriz_diseno(dfRegresion, log_conteo=True, precios=True), y)
+print(modeloPrecios.resumen())
 
 # Graficar datos y línea de regresión
 plt.scatter(X, y, alpha=0.4, label='Datos reales')
@@ -1,92 +1,68 @@
 # Full Python script that queries Google Places API for "Tacos" in 225 grid squares (15x15)
 # and saves the results into tacos_CDMX.csv with rate limiting
 
-import json
-import requests
-import csv
-import time
+import argparse
+import asyncio
+from crawler_places import BBOX_CDMX, CrawlerPlaces, celdas_cuadricula
+from cuadricula_adaptativa import expansion_adaptativa
+from deduplicador import DeduplicadorLugares
+from diario_respuestas import TTL_HORAS, DiarioRespuestas
+from salida_lugares import SalidaLugares
 from llave import GOOGLE_MAPS_API_KEY
 
 apiKey = GOOGLE_MAPS_API_KEY
 print(f"Using API key: {apiKey[:4]}***")
 
-# Step 1: Definimos el area de la Ciudad de México
-lat_min, lng_min = 19.29099, -99.224607  # Southwest corner
-lat_max, lng_max = 19.521517, -99.036189  # Northeast corner
+parser = argparse.ArgumentParser(description="Tacos en CDMX con Places API")
+parser.add_argument("--adaptativa", action="store_true",
+                    help="Empieza con una cuadrícula gruesa y divide en 4 las celdas saturadas")
+parser.add_argument("--grid-size", type=int, default=None,
+                    help="Celdas por lado (15 fija, 4 adaptativa por omisión)")
+parser.add_argument("--diario", default="respuestas_places.sqlite",
+                    help="Diario de respuestas para reanudar y no repetir solicitudes")
+parser.add_argument("--ttl-horas", type=float, default=TTL_HORAS,
+                    help="Antigüedad máxima de una respuesta del diario")
+parser.add_argument("--sin-diario", action="store_true", help="Siempre consulta la API")
+args = parser.parse_args()
 
-# Step 2: Dividimos el area en una cuadrícula de 15x15
-grid_size = 15
-lat_step = (lat_max - lat_min) / grid_size
-lng_step = (lng_max - lng_min) / grid_size
+# Step 1: Definimos el area de la Ciudad de México (lat_min, lng_min, lat_max, lng_max)
+# Step 2: Dividimos el area en una cuadrícula de 15x15 (o 4x4 que se subdivide donde hay
+# más de 20 resultados; ver simulacion_cuadricula.py)
+grid_size = args.grid_size or (4 if args.adaptativa else 15)
+celdas = celdas_cuadricula(BBOX_CDMX, grid_size)
+expandir = expansion_adaptativa() if args.adaptativa else None
 
-# Step 3:  Pereparamos los headers para la solicitud de la API
-headers = {
-    "Content-Type": "application/json",
-    "X-Goog-Api-Key": apiKey,
-    "X-Goog-FieldMask": "places.displayName,places.generativeSummary,places.formattedAddress,places.priceLevel,places.priceRange,places.rating,places.userRatingCount,places.location,places.websiteUri"
-}
+# Step 3: El crawler arma los headers (API key y field mask) y reparte las solicitudes
+# a 10 por segundo con varias en vuelo a la vez, reintentando 429/5xx. Cada respuesta
+# se guarda en el diario: si el script se cae, al volver a correrlo sigue donde iba
+diario = None if args.sin_diario else DiarioRespuestas(args.diario, args.ttl_horas)
+crawler = CrawlerPlaces(apiKey, tasa=10, concurrencia=16, diario=diario)
 
-tacos_CDMX = []
+# Un mismo lugar puede salir en varias celdas; solo se guarda la primera vez
+deduplicador = DeduplicadorLugares()
 
-# Step 4: for para cada celda de la cuadrícula, hacemos una solicitud a la API
-for i in range(grid_size):
-    for j in range(grid_size):
-        sw_lat = lat_min + i * lat_step
-        sw_lng = lng_min + j * lng_step
-        ne_lat = sw_lat + lat_step
-        ne_lng = sw_lng + lng_step
 
-        payload = {
-            "textQuery": "Tacos",
-            "locationRestriction": {
-                "rectangle": {
-                    "low": {
-                        "latitude": round(sw_lat, 6),
-                        "longitude": round(sw_lng, 6)
-                    },
-                    "high": {
-                        "latitude": round(ne_lat, 6),
-                        "longitude": round(ne_lng, 6)
-                    }
-                }
-            }
-        }
+# Step 4: una solicitud por celda; los resultados llegan en el orden en que terminan
+# Step 5: los lugares nuevos se van escribiendo por lotes a tacos_CDMX.csv y a
+# tacos_CDMX_parquet/ (columnas fijas; website = websiteUri, genAI = resumen generativo)
+async def recorrer(salida):
+    async for clave, _, data in crawler.recorrer("Tacos", celdas, expandir=expandir):
+        if data is None:
+            continue
+        salida.agregar(deduplicador.filtrar(data.get("places", [])), consulta="Tacos", ciudad="CDMX")
+        print(f"✅ Processed cell {clave} - {len(deduplicador)} places found so far.")
 
-        response = requests.post(
-            "https://places.googleapis.com/v1/places:searchText",
-            headers=headers,
-            data=json.dumps(payload)
-        )
 
-        if response.status_code == 200: 
-            # Parse the JSON response
-            data = response.json()
-            for place in data.get("places", []):
-                # Con un for creamos una lista con los datos que queremos
-                tacos_CDMX.append({
-                    "name": place.get("displayName", {}).get("text"),
-                    "address": place.get("formattedAddress"),
-                    "lat": place.get("location", {}).get("latitude"),
-                    "lng": place.get("location", {}).get("longitude"),
-                    "rating": place.get("rating"),
-                    "userRatingCount": place.get("userRatingCount"),
-                    "priceLevel": place.get("priceLevel"),
-                    "website": place.get("generativeSummary"),
-                    "genAI": place.get("websiteUri")
-                })
-        else:
-            print(f"❌ Error in cell ({i}, {j}): {response.status_code} - {response.text}")
+with SalidaLugares("tacos_CDMX.csv", "tacos_CDMX_parquet") as salida:
+    asyncio.run(recorrer(salida))
 
-        # ⏱️ Add delay to respect 10 requests per second limit
-        time.sleep(0.4)
-        print(f"✅ Processed cell ({i}, {j}) - {len(tacos_CDMX)} places found so far.")
+print(f"📊 {crawler.estadisticas['solicitudes']} requests, {crawler.estadisticas['reintentos']} retries, "
+      f"{crawler.estadisticas['errores']} failed cells, {crawler.estadisticas['del_diario']} from journal")
+print(f"🧹 {deduplicador.duplicados} duplicate places skipped")
+if diario is not None:
+    diario.cerrar()
 
-# Step 5: Export results to CSV
-if tacos_CDMX:
-    with open("tacos_CDMX.csv", mode="w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=tacos_CDMX[0].keys())
-        writer.writeheader()
-        writer.writerows(tacos_CDMX)
-    print(f"✅ CSV saved as tacos_CDMX.csv with {len(tacos_CDMX)} places.")
+if salida.filas:
+    print(f"✅ CSV saved as tacos_CDMX.csv with {salida.filas} places.")
 else:
     print("⚠️ No results to save.")
@@ -1,24 +1,20 @@
-import pandas as pd
 import matplotlib.pyplot as plt
+from perfil_lugares import PerfilLugares, leer_lugares
 
 # Cambia esta ruta por la del archivo real que quieres analizar
 file_path = "tacos_CDMX.csv"
 
-# Leer el archivo CSV
-df = pd.read_csv(file_path)
-
-# Separar los que tienen priceLevel y los que no
-with_price = df[df['priceLevel'].notna()]
-without_price = df[df['priceLevel'].isna()]
+# Leer el archivo CSV (priceLevel como categoría) y perfilarlo en una pasada
+perfil = PerfilLugares(leer_lugares(file_path))
 
 # Conteo de cada nivel de precio
-price_counts = with_price['priceLevel'].value_counts()
+price_counts = perfil.precios
 
 # Mostrar resumen
 print("Resumen:")
-print(f"Total de lugares: {len(df)}")
-print(f"Con priceLevel: {len(with_price)}")
-print(f"Sin priceLevel: {len(without_price)}")
+print(f"Total de lugares: {perfil.n}")
+print(f"Con priceLevel: {perfil.validos['priceLevel']}")
+print(f"Sin priceLevel: {perfil.nulos['priceLevel']}")
 print("\nDistribución de niveles de precio:")
 print(price_counts)
 